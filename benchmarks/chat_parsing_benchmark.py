@@ -0,0 +1,227 @@
+# A microbenchmark of turning a chat's stored messages into Message objects, run from the root of the repository like:
+# python -m benchmarks.chat_parsing_benchmark --messages 1000 10000 100000 --members 2 50
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Local imports.
+from benchmarks.common import DatabasePair, create_application
+from src.shared.objects import Member, Message, Chat
+from src.shared.migrations import migrate
+
+def parse_split(messages_json: str, members: list[Member]) -> list[Message]:
+    """A function parsing a json messages blob the way Chat.get_messages used to, splitting on "}, " and searching the members for every message.
+    
+    Args:
+        messages_json (str): Messages of the chat as a json list of {"user_id", "text"} objects.
+        members (list[Member]): Members of the chat.
+    
+    Returns:
+        list[Message]: Messages of the chat, wrong if any text contains "}, ".
+    """
+    message_dicts = messages_json.replace("[", "").replace("]", "").split("}, ")
+    
+    if message_dicts[0] == "":
+        return []
+    
+    raw_messages : list[dict] = []
+    for message in message_dicts:
+        if message[-1] != "}":
+            message = message + "}"
+        
+        try:
+            raw_message = json.loads(message)
+        
+        except json.JSONDecodeError:
+            continue # The text contained a separator, the message is lost.
+        
+        if isinstance(raw_message, dict) and "user_id" in raw_message:
+            raw_messages.append(raw_message) # Pieces of a split message can still decode, those are lost too.
+    
+    messages : list[Message] = []
+    for message in raw_messages:
+        for member in members:
+            if member.id == message["user_id"]:
+                messages.append(Message(member, message["text"]))
+    
+    return messages
+
+def parse_json(messages_json: str, members: list[Member]) -> list[Message]:
+    """A function parsing a json messages blob with a single json.loads and an ID to member map.
+    
+    Args:
+        messages_json (str): Messages of the chat as a json list of {"user_id", "text"} objects.
+        members (list[Member]): Members of the chat.
+    
+    Returns:
+        list[Message]: Messages of the chat.
+    """
+    members_by_id = {member.id: member for member in members}
+    
+    return [
+        Message(members_by_id[message["user_id"]], message["text"])
+        for message in json.loads(messages_json)
+        if message["user_id"] in members_by_id
+    ]
+
+def resolve_nested(rows: list[tuple], members: list[Member]) -> list[Message]:
+    """A function creating messages from (id, member_id, sent_at, text) rows by searching the members for every message.
+    
+    Args:
+        rows (list[tuple]): Message rows of the chat.
+        members (list[Member]): Members of the chat.
+    
+    Returns:
+        list[Message]: Messages of the chat.
+    """
+    messages : list[Message] = []
+    for message_id, member_id, sent_at, text in rows:
+        for member in members:
+            if member.id == member_id:
+                messages.append(Message(member, text, message_id, datetime.fromtimestamp(sent_at)))
+    
+    return messages
+
+class ChatParsingBenchmark:
+    def __init__(self, data_dir: str, message_count: int, member_count: int, seed: int):
+        """A class object containing a chat of a given size, stored both as rows and as a legacy json blob.
+        
+        Args:
+            data_dir (str): Directory the databases are made in.
+            message_count (int): Messages in the chat.
+            member_count (int): Members in the chat.
+            seed (int): Seed of the message text and senders.
+        """
+        self.random = random.Random(seed)
+        
+        self.databases = DatabasePair(
+            os.path.join(data_dir, f"chat_{message_count}_{member_count}.sqlite"),
+            os.path.join(data_dir, f"gym_{message_count}_{member_count}.sqlite")
+        )
+        
+        migrate(self.databases.chat_src, "chat")
+        migrate(self.databases.gym_src, "gym")
+        
+        gym = self.databases.create_database_manager("data/gym.sqlite")
+        chat = self.databases.create_database_manager("data/chat.sqlite")
+        
+        gym.connection.executemany(
+            "INSERT INTO members (id, forename, surname, email, phone, password, is_tutor, profile) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(id, "Forename", "Surname", f"member{id}@example.com", "07000000000", "password", 0, "1.png") for id in range(1, member_count + 1)]
+        )
+        gym.connection.commit()
+        
+        self.member_ids = list(range(1, member_count + 1))
+        
+        # Roughly one message in six contains the separator the split parser breaks on.
+        words = ["lift", "squat", "class", "tomorrow", "thanks", "see you", "{\"a\": 1}, ok", "}, {"]
+        weights = [10, 10, 10, 10, 10, 10, 1, 1]
+        
+        rows = []
+        for x in range(message_count):
+            text = " ".join(self.random.choices(words, weights, k = 6))
+            rows.append((self.random.choice(self.member_ids), 1700000000 + x, text))
+        
+        chat.connection.execute("INSERT INTO chats (id, members, messages) VALUES (1, ?, '[]')", (json.dumps(self.member_ids),))
+        chat.connection.executemany(
+            "INSERT INTO chat_members (chat_id, member_id) VALUES (1, ?)",
+            [(id,) for id in self.member_ids]
+        )
+        chat.connection.executemany("INSERT INTO messages (chat_id, member_id, sent_at, text) VALUES (1, ?, ?, ?)", rows)
+        chat.connection.commit()
+        
+        # The same messages as the blob the chats table used to hold.
+        self.messages_json = json.dumps([{"user_id": member_id, "text": text} for member_id, sent_at, text in rows])
+        self.message_count = message_count
+    
+    def get_parsers(self) -> dict:
+        """A function to get each way of parsing the chat's messages.
+        
+        Returns:
+            dict: Names of the parsers and a function running each.
+        """
+        chat = Chat(1, self.member_ids)
+        members = chat.members
+        
+        def get_rows() -> list[tuple]:
+            return self.databases.create_database_manager("data/chat.sqlite").get_chat_messages(1)
+        
+        return {
+            "blob_split_nested": lambda: parse_split(self.messages_json, members),
+            "blob_json_loads_map": lambda: parse_json(self.messages_json, members),
+            "rows_nested": lambda: resolve_nested(get_rows(), members),
+            "rows_map (Chat.get_messages)": chat.get_messages
+        }
+    
+    def run(self, repeats: int) -> dict:
+        """A function to time each parser, keeping the fastest of several runs.
+        
+        Args:
+            repeats (int): Runs of each parser.
+        
+        Returns:
+            dict: Names of the parsers and their fastest time in milliseconds and messages parsed.
+        """
+        results = {}
+        
+        for name, parser in self.get_parsers().items():
+            fastest = None
+            
+            for x in range(repeats):
+                started_at = time.perf_counter()
+                messages = parser()
+                elapsed_ms = (time.perf_counter() - started_at) * 1000
+                
+                fastest = elapsed_ms if fastest is None else min(fastest, elapsed_ms)
+            
+            results[name] = {"ms": fastest, "messages": len(messages)}
+            
+            print(f"  {name:<30} {fastest:>10.2f}ms  {len(messages):>8} of {self.message_count} messages")
+        
+        return results
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compare the old and new ways of turning a chat's messages into Message objects.")
+    parser.add_argument("--messages", nargs = "+", type = int, default = [1000, 10000, 100000], help = "Messages in each chat.")
+    parser.add_argument("--members", nargs = "+", type = int, default = [2, 50], help = "Members in each chat.")
+    parser.add_argument("--repeats", type = int, default = 5, help = "Runs of each parser, the fastest is kept.")
+    parser.add_argument("--seed", type = int, default = 2073)
+    parser.add_argument("--output", default = None, help = "Path to write the JSON results to.")
+    arguments = parser.parse_args()
+    
+    application = create_application()
+    
+    temporary_dir = tempfile.TemporaryDirectory()
+    results = {"python": sys.version.split()[0], "sqlite": sqlite3.sqlite_version, "chats": []}
+    
+    for message_count in arguments.messages:
+        for member_count in arguments.members:
+            print(f"\n{message_count} messages, {member_count} members")
+            
+            benchmark = ChatParsingBenchmark(temporary_dir.name, message_count, member_count, arguments.seed)
+            benchmark.databases.install(application)
+            
+            results["chats"].append({
+                "messages": message_count,
+                "members": member_count,
+                "parsers": benchmark.run(arguments.repeats)
+            })
+            
+            benchmark.databases.close()
+    
+    if arguments.output is not None:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent = 4)
+        
+        print(f"\nResults written to {arguments.output}")
+    
+    temporary_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
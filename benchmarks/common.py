@@ -0,0 +1,64 @@
+# Helpers shared by the benchmarks, pointing the application at databases made for a run.
+import sys
+
+# Third-party imports.
+from PySide6.QtCore import QCoreApplication
+
+# Local imports.
+from src.application.managers.database_manager import DatabaseManager, DatabaseProfile, ConnectionPool, member_cache
+
+def create_application() -> QCoreApplication:
+    """A function to create the application the objects get their DatabaseManager from, no display is needed for a core application.
+    
+    Returns:
+        QCoreApplication: The running application, created if there isn't one yet.
+    """
+    application = QCoreApplication.instance()
+    
+    if application is None:
+        application = QCoreApplication(sys.argv)
+    
+    return application
+
+class DatabasePair:
+    def __init__(self, chat_src: str, gym_src: str):
+        """A class object containing a chat and gym database made for a benchmark, with their own connection pool.
+        
+        Args:
+            chat_src (str): Path to the chat database.
+            gym_src (str): Path to the gym database.
+        """
+        self.chat_src = chat_src
+        self.gym_src = gym_src
+        
+        self.connection_pool = ConnectionPool(DatabaseProfile.load())
+    
+    def create_database_manager(self, database_src: str) -> DatabaseManager:
+        """A function used as the application's DatabaseManager, pointing the application's database paths at the benchmark databases.
+        
+        Args:
+            database_src (str): Path to the database, like data/gym.sqlite.
+        
+        Returns:
+            DatabaseManager: Database manager of the matching benchmark database.
+        """
+        if database_src.endswith("chat.sqlite"):
+            return DatabaseManager(self.chat_src, self.connection_pool)
+        
+        return DatabaseManager(self.gym_src, self.connection_pool)
+    
+    def install(self, application: QCoreApplication):
+        """A function to have the application use these databases, starting with an empty member cache.
+        
+        Args:
+            application (QCoreApplication): Application the objects get their DatabaseManager from.
+        """
+        member_cache.clear()
+        
+        application.setProperty("DatabaseManager", self.create_database_manager)
+        application.setProperty("ConnectionPool", self.connection_pool)
+    
+    def close(self):
+        """A function to close the connections to the databases and forget the members cached from them."""
+        self.connection_pool.close_all()
+        member_cache.clear()
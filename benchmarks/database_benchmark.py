@@ -0,0 +1,310 @@
+# A headless benchmark of the DatabaseManager, run from the root of the repository like:
+# python -m benchmarks.database_benchmark --presets default 1k 100k --output results.json
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+# Local imports.
+from benchmarks.common import DatabasePair, create_application
+from src.shared.objects import Member, Message, Chat, AvailableClass
+from src.shared.migrations import migrate
+from src.shared.testing_data import TestingData
+from src.application.managers.database_manager import DatabaseProfile, member_cache
+
+class BenchmarkDatabases(DatabasePair):
+    def __init__(self, preset: str, seed: int, data_dir: str, workers: int = 1):
+        """A class object containing a pair of databases seeded with a testing data preset.
+        
+        Databases already in the data directory are topped up instead of being generated again.
+        
+        Args:
+            preset (str): Name of the testing data preset.
+            seed (int): Seed of the testing data.
+            data_dir (str): Directory the databases are stored in.
+            workers (int, optional): Processes generating the testing data.
+        """
+        self.preset = preset
+        chat_src = os.path.join(data_dir, f"{preset}_{seed}", "chat.sqlite")
+        gym_src = os.path.join(data_dir, f"{preset}_{seed}", "gym.sqlite")
+        
+        os.makedirs(os.path.dirname(chat_src), exist_ok = True)
+        
+        started_at = time.perf_counter()
+        
+        migrate(chat_src, "chat")
+        migrate(gym_src, "gym")
+        TestingData(preset, seed, chat_src, gym_src, workers)
+        
+        self.seed_seconds = time.perf_counter() - started_at
+        
+        super().__init__(chat_src, gym_src)
+    
+    def get_row_counts(self) -> dict[str, int]:
+        """A function to count the rows of every table the benchmark reads.
+        
+        Returns:
+            dict[str, int]: Table names and their row counts.
+        """
+        counts = {}
+        
+        for database_src, tables in [
+            (self.gym_src, ["members", "classes", "enrollments"]),
+            (self.chat_src, ["chats", "chat_members", "messages"])
+        ]:
+            connection = sqlite3.connect(database_src)
+            
+            for table in tables:
+                counts[table] = connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            
+            connection.close()
+        
+        return counts
+
+class DatabaseBenchmark:
+    # Percentiles reported for every operation.
+    percentiles = [50, 90, 95, 99]
+    
+    def __init__(self, databases: BenchmarkDatabases, iterations: int, seed: int, warmup: int = 10):
+        """A class object timing the core DatabaseManager operations against a pair of seeded databases.
+        
+        Args:
+            databases (BenchmarkDatabases): Databases to run against.
+            iterations (int): Timed calls of each operation.
+            seed (int): Seed picking the members, chats and classes each call uses.
+            warmup (int, optional): Untimed calls made before timing each operation.
+        """
+        self.databases = databases
+        self.iterations = iterations
+        self.warmup = warmup
+        self.random = random.Random(seed)
+        
+        self.gym = databases.create_database_manager("data/gym.sqlite")
+        self.chat = databases.create_database_manager("data/chat.sqlite")
+        
+        # Inputs picked from for each call.
+        self.member_ids = [fetch[0] for fetch in self.gym.connection.execute("SELECT id FROM members")]
+        self.emails = [fetch[0] for fetch in self.gym.connection.execute("SELECT email FROM members")]
+        self.class_ids = [fetch[0] for fetch in self.gym.connection.execute("SELECT id FROM classes")]
+        self.chat_pairs = self.chat.connection.execute(
+            "SELECT chat_id, MIN(member_id), MAX(member_id) FROM chat_members GROUP BY chat_id"
+        ).fetchall()
+    
+    def get_operations(self) -> dict:
+        """A function to get the operations to time.
+        
+        Each operation is a setup function, run untimed to pick its inputs, and a function timed with those inputs.
+        
+        Returns:
+            dict: Names of the operations and their setup and timed functions.
+        """
+        def random_member() -> Member:
+            return self.gym.get_member(id = self.random.choice(self.member_ids))
+        
+        def random_class() -> AvailableClass:
+            return self.gym.get_class(self.random.choice(self.class_ids))
+        
+        def random_pair() -> tuple[Member, Member]:
+            chat_id, member_1_id, member_2_id = self.random.choice(self.chat_pairs)
+            
+            return self.gym.get_member(id = member_1_id), self.gym.get_member(id = member_2_id)
+        
+        def random_chat() -> tuple[Chat, Message]:
+            chat = self.chat.get_chat(self.random.choice(self.chat_pairs)[0])
+            
+            return chat, Message(chat.members[0], "Benchmark message")
+        
+        def uncached(setup):
+            # Cached members would hide the query, so they're dropped before each timed call.
+            def setup_uncached():
+                inputs = setup()
+                member_cache.clear()
+                
+                return inputs
+            
+            return setup_uncached
+        
+        return {
+            "get_member_by_id": (
+                uncached(lambda: (self.random.choice(self.member_ids),)),
+                lambda id: self.gym.get_member(id = id)
+            ),
+            "get_member_by_email": (
+                uncached(lambda: (self.random.choice(self.emails),)),
+                lambda email: self.gym.get_member(email = email)
+            ),
+            "get_member_by_id_cached": (
+                lambda: (self.random.choice(self.member_ids[:100]),),
+                lambda id: self.gym.get_member(id = id)
+            ),
+            "get_member_chats": (
+                lambda: (random_member(),),
+                self.chat.get_member_chats
+            ),
+            "get_personal_chat": (
+                uncached(random_pair),
+                self.chat.get_personal_chat
+            ),
+            "add_message": (
+                random_chat,
+                self.chat.add_message
+            ),
+            "get_all_classes": (
+                lambda: (),
+                self.gym.get_all_classes
+            ),
+            "get_member_classes": (
+                lambda: (random_member(),),
+                self.gym.get_member_classes
+            ),
+            "add_member_to_class": (
+                lambda: (random_member(), random_class()),
+                self.gym.add_member_to_class
+            )
+        }
+    
+    def run(self, operations: list[str] = None) -> dict:
+        """A function to time each operation.
+        
+        Args:
+            operations (list[str], optional): Names of the operations to run, defaults to all of them.
+        
+        Returns:
+            dict: Names of the operations and their latency statistics in milliseconds.
+        """
+        results = {}
+        
+        for name, (setup, function) in self.get_operations().items():
+            if operations is not None and name not in operations:
+                continue
+            
+            for x in range(self.warmup):
+                function(*setup())
+            
+            timings : list[float] = []
+            
+            for x in range(self.iterations):
+                inputs = setup()
+                
+                started_at = time.perf_counter()
+                function(*inputs)
+                timings.append((time.perf_counter() - started_at) * 1000)
+            
+            results[name] = self.summarise(timings)
+            
+            print(
+                f"  {name:<26} p50 {results[name]['p50_ms']:>9.3f}ms  p99 {results[name]['p99_ms']:>9.3f}ms  "
+                f"max {results[name]['max_ms']:>9.3f}ms"
+            )
+        
+        return results
+    
+    def summarise(self, timings: list[float]) -> dict:
+        """A function to get the latency statistics of an operation.
+        
+        Args:
+            timings (list[float]): Milliseconds each call took.
+        
+        Returns:
+            dict: Percentiles, mean, minimum and maximum in milliseconds.
+        """
+        timings = sorted(timings)
+        
+        summary = {
+            f"p{percentile}_ms": timings[min(len(timings) - 1, int(len(timings) * percentile / 100))]
+            for percentile in self.percentiles
+        }
+        summary["mean_ms"] = sum(timings) / len(timings)
+        summary["min_ms"] = timings[0]
+        summary["max_ms"] = timings[-1]
+        summary["calls"] = len(timings)
+        
+        return summary
+
+def print_scaling(results: dict):
+    """A function to print the median latency of each operation at every size, showing how it scales.
+    
+    Args:
+        results (dict): Results of each preset.
+    """
+    presets = list(results["presets"].keys())
+    
+    print(f"\nMedian latency (ms) by preset")
+    print(f"  {'operation':<26}" + "".join(f"{preset:>12}" for preset in presets))
+    
+    operations = results["presets"][presets[0]]["operations"].keys()
+    
+    for operation in operations:
+        row = "".join(f"{results['presets'][preset]['operations'][operation]['p50_ms']:>12.3f}" for preset in presets)
+        print(f"  {operation:<26}{row}")
+
+def main():
+    parser = argparse.ArgumentParser(description = "Time the core DatabaseManager operations at several database sizes.")
+    parser.add_argument("--presets", nargs = "+", default = ["default", "1k"], choices = TestingData.presets.keys())
+    parser.add_argument("--iterations", type = int, default = 200, help = "Timed calls of each operation.")
+    parser.add_argument("--seed", type = int, default = 2073)
+    parser.add_argument("--workers", type = int, default = 1, help = "Processes generating the testing data.")
+    parser.add_argument("--operations", nargs = "+", default = None, help = "Operations to run, defaults to all of them.")
+    parser.add_argument("--data-dir", default = None, help = "Directory to keep the seeded databases in, reused between runs.")
+    parser.add_argument("--output", default = None, help = "Path to write the JSON results to.")
+    arguments = parser.parse_args()
+    
+    application = create_application()
+    
+    temporary_dir = None
+    data_dir = arguments.data_dir
+    
+    if data_dir is None:
+        temporary_dir = tempfile.TemporaryDirectory()
+        data_dir = temporary_dir.name
+    
+    results = {
+        "created_at": datetime.now().isoformat(timespec = "seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "profile": DatabaseProfile.load().name,
+        "seed": arguments.seed,
+        "iterations": arguments.iterations,
+        "presets": {}
+    }
+    
+    for preset in arguments.presets:
+        print(f"\nSeeding the {preset} preset")
+        
+        databases = BenchmarkDatabases(preset, arguments.seed, data_dir, arguments.workers)
+        databases.install(application)
+        
+        print(f"\nTiming the {preset} preset")
+        
+        benchmark = DatabaseBenchmark(databases, arguments.iterations, arguments.seed)
+        
+        results["presets"][preset] = {
+            "seed_seconds": databases.seed_seconds,
+            "rows": databases.get_row_counts(),
+            "operations": benchmark.run(arguments.operations)
+        }
+        
+        databases.close()
+    
+    print_scaling(results)
+    
+    if arguments.output is not None:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent = 4)
+        
+        print(f"\nResults written to {arguments.output}")
+    
+    else:
+        print(json.dumps(results, indent = 4))
+    
+    if temporary_dir is not None:
+        temporary_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# A stress test of enrolling into classes from many processes at once, run from the root of the repository like:
+# python -m benchmarks.enrollment_stress --processes 8 --attempts 500
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+# Local imports.
+from src.shared.objects import EnrollmentResult
+from src.shared.migrations import migrate
+from src.application.managers.database_manager import DatabaseManager, DatabaseProfile, ConnectionPool
+
+def enroll_legacy(database_manager: DatabaseManager, member_id: int, class_id: int, capacity: int) -> EnrollmentResult:
+    """A function enrolling the way the application used to, reading applied_members, adding to it and writing it back without a transaction.
+    
+    Args:
+        database_manager (DatabaseManager): Database manager of the gym database.
+        member_id (int): ID of the member being enrolled.
+        class_id (int): ID of the class the member is being enrolled into.
+        capacity (int): Most members the class can hold.
+    
+    Returns:
+        EnrollmentResult: Outcome the terminal would have shown.
+    """
+    connection = database_manager.connection
+    
+    class_members : list[int] = json.loads(
+        connection.execute("SELECT applied_members FROM classes WHERE id = ?", (class_id,)).fetchone()[0]
+    )
+    
+    if member_id in class_members:
+        return EnrollmentResult.ALREADY_ENROLLED
+    
+    if len(class_members) >= capacity:
+        return EnrollmentResult.FULL
+    
+    class_members.append(member_id)
+    
+    connection.execute("UPDATE classes SET applied_members = ? WHERE id = ?", (json.dumps(class_members), class_id))
+    connection.commit()
+    
+    return EnrollmentResult.ENROLLED
+
+def run_terminal(arguments: tuple) -> dict:
+    """A function acting as one front desk terminal, enrolling random members into random classes as fast as it can.
+    
+    Args:
+        arguments (tuple): Path to the gym database, mode, terminal index, attempts, member count, class count, capacity, seed and start event.
+    
+    Returns:
+        dict: Counts of each result, the enrollments it made and how long it took.
+    """
+    gym_src, mode, index, attempts, member_count, class_count, capacity, seed, start_event = arguments
+    
+    terminal_random = random.Random(f"{seed}-{index}")
+    database_manager = DatabaseManager(gym_src, ConnectionPool(DatabaseProfile.load()))
+    
+    results = {result.value: 0 for result in EnrollmentResult}
+    enrolled : list[tuple[int, int]] = []
+    errors = 0
+    
+    start_event.wait() # Every terminal starts together, for the most contention.
+    started_at = time.perf_counter()
+    
+    for x in range(attempts):
+        member_id = terminal_random.randint(1, member_count)
+        class_id = terminal_random.randint(1, class_count)
+        
+        try:
+            if mode == "atomic":
+                result = database_manager.enroll(member_id, class_id)
+            
+            else:
+                result = enroll_legacy(database_manager, member_id, class_id, capacity)
+        
+        except sqlite3.OperationalError:
+            database_manager.connection.rollback()
+            errors += 1 # Locked for longer than the busy timeout.
+            
+            continue
+        
+        results[result.value] += 1
+        
+        if result is EnrollmentResult.ENROLLED:
+            enrolled.append((class_id, member_id))
+    
+    return {
+        "results": results,
+        "enrolled": enrolled,
+        "errors": errors,
+        "seconds": time.perf_counter() - started_at
+    }
+
+class EnrollmentStress:
+    def __init__(self, data_dir: str, mode: str, member_count: int, class_count: int, capacity: int):
+        """A class object containing a gym database of classes with a capacity, for terminals to enroll into at the same time.
+        
+        Args:
+            data_dir (str): Directory the database is made in.
+            mode (str): atomic to use DatabaseManager.enroll, legacy to use the old read-modify-write of applied_members.
+            member_count (int): Members that can be enrolled.
+            class_count (int): Classes that can be enrolled into.
+            capacity (int): Most members each class can hold.
+        """
+        self.mode = mode
+        self.member_count = member_count
+        self.class_count = class_count
+        self.capacity = capacity
+        
+        self.gym_src = os.path.join(data_dir, f"gym_{mode}.sqlite")
+        migrate(self.gym_src, "gym")
+        
+        connection = sqlite3.connect(self.gym_src)
+        connection.executemany(
+            "INSERT INTO members (id, forename, surname, email, phone, password, is_tutor, profile) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(id, "Forename", "Surname", f"member{id}@example.com", "07000000000", "password", 0, "1.png") for id in range(1, member_count + 1)]
+        )
+        connection.executemany(
+            "INSERT INTO classes (id, tutor_id, applied_members, title, description, start_date, start_at, capacity) VALUES (?, 1, '[]', 'Class', '', '', 0, ?)",
+            [(id, capacity) for id in range(1, class_count + 1)]
+        )
+        connection.commit()
+        connection.close()
+    
+    def run(self, processes: int, attempts: int, seed: int) -> dict:
+        """A function to run the terminals at the same time and check no enrollment was lost.
+        
+        Args:
+            processes (int): Terminals enrolling at the same time, each its own process.
+            attempts (int): Enrollments each terminal attempts.
+            seed (int): Seed of the members and classes each terminal picks.
+        
+        Returns:
+            dict: Results of the run, with what the terminals reported and what the database holds.
+        """
+        context = multiprocessing.get_context("spawn")
+        start_event = context.Manager().Event()
+        
+        with context.Pool(processes) as pool:
+            pending = pool.map_async(run_terminal, [
+                (self.gym_src, self.mode, index, attempts, self.member_count, self.class_count, self.capacity, seed, start_event)
+                for index in range(processes)
+            ])
+            
+            time.sleep(1) # Let every process start before releasing them.
+            start_event.set()
+            
+            terminals = pending.get()
+        
+        results = {result.value: sum(terminal["results"][result.value] for terminal in terminals) for result in EnrollmentResult}
+        reported = {enrollment for terminal in terminals for enrollment in terminal["enrolled"]}
+        seconds = max(terminal["seconds"] for terminal in terminals)
+        
+        stored = self.get_stored_enrollments()
+        class_sizes = [sum(1 for class_id, member_id in stored if class_id == id) for id in range(1, self.class_count + 1)]
+        
+        summary = {
+            "mode": self.mode,
+            "processes": processes,
+            "attempts": processes * attempts,
+            "results": results,
+            "errors": sum(terminal["errors"] for terminal in terminals),
+            "seconds": seconds,
+            "attempts_per_second": processes * attempts / seconds,
+            "enrollments_per_second": results["enrolled"] / seconds,
+            "stored": len(stored),
+            "lost": len(reported - stored), # Terminals told the member they were enrolled, but they weren't.
+            "duplicates": results["enrolled"] - len(reported), # The same member enrolled into a class twice.
+            "over_capacity": sum(max(0, size - self.capacity) for size in class_sizes)
+        }
+        
+        print(
+            f"  {self.mode:<7} {summary['attempts']:>7} attempts in {seconds:.2f}s  "
+            f"{summary['attempts_per_second']:>8.0f} attempts/s  {summary['enrollments_per_second']:>7.0f} enrollments/s  "
+            f"{results}  errors {summary['errors']}"
+        )
+        print(
+            f"          stored {summary['stored']}  lost {summary['lost']}  "
+            f"duplicates {summary['duplicates']}  over capacity {summary['over_capacity']}"
+        )
+        
+        return summary
+    
+    def get_stored_enrollments(self) -> set[tuple[int, int]]:
+        """A function to get every enrollment the database holds once the terminals are done.
+        
+        Returns:
+            set[tuple[int, int]]: Class and member ID of each enrollment.
+        """
+        connection = sqlite3.connect(self.gym_src)
+        
+        if self.mode == "atomic":
+            stored = set(connection.execute("SELECT class_id, member_id FROM enrollments").fetchall())
+        
+        else:
+            stored = set()
+            for class_id, applied_members in connection.execute("SELECT id, applied_members FROM classes"):
+                stored.update((class_id, member_id) for member_id in json.loads(applied_members))
+        
+        connection.close()
+        
+        return stored
+
+def main():
+    parser = argparse.ArgumentParser(description = "Enroll into classes from many processes at once, checking no enrollment is lost.")
+    parser.add_argument("--processes", type = int, default = 4, help = "Terminals enrolling at the same time.")
+    parser.add_argument("--attempts", type = int, default = 500, help = "Enrollments each terminal attempts.")
+    parser.add_argument("--members", type = int, default = 200, help = "Members that can be enrolled.")
+    parser.add_argument("--classes", type = int, default = 10, help = "Classes that can be enrolled into.")
+    parser.add_argument("--capacity", type = int, default = 15, help = "Most members each class can hold.")
+    parser.add_argument("--modes", nargs = "+", default = ["atomic", "legacy"], choices = ["atomic", "legacy"])
+    parser.add_argument("--seed", type = int, default = 2073)
+    parser.add_argument("--output", default = None, help = "Path to write the JSON results to.")
+    arguments = parser.parse_args()
+    
+    temporary_dir = tempfile.TemporaryDirectory()
+    summaries = []
+    
+    print(f"{arguments.processes} terminals, {arguments.classes} classes of {arguments.capacity}, {arguments.members} members")
+    
+    for mode in arguments.modes:
+        stress = EnrollmentStress(temporary_dir.name, mode, arguments.members, arguments.classes, arguments.capacity)
+        summaries.append(stress.run(arguments.processes, arguments.attempts, arguments.seed))
+    
+    if arguments.output is not None:
+        with open(arguments.output, "w") as file:
+            json.dump(summaries, file, indent = 4)
+        
+        print(f"\nResults written to {arguments.output}")
+    
+    temporary_dir.cleanup()
+    
+    # Fail the run if the atomic enrollment ever lost or overfilled anything.
+    for summary in summaries:
+        if summary["mode"] == "atomic" and (summary["lost"] or summary["duplicates"] or summary["over_capacity"]):
+            raise SystemExit("Atomic enrollment lost or overfilled enrollments.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+CREATE TABLE IF NOT EXISTS `chat_members` (`chat_id` INTEGER NOT NULL, `member_id` INTEGER NOT NULL, PRIMARY KEY (`chat_id`, `member_id`)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS `chat_members_member_id` ON `chat_members` (`member_id`, `chat_id`);
+INSERT OR IGNORE INTO `chat_members` (`chat_id`, `member_id`) SELECT `chats`.`id`, CAST(`json_each`.`value` AS INTEGER) FROM `chats`, json_each(`chats`.`members`);
@@ -0,0 +1,4 @@
+CREATE TABLE IF NOT EXISTS `messages` (`id` INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE NOT NULL, `chat_id` INTEGER NOT NULL, `member_id` INTEGER NOT NULL, `sent_at` INTEGER NOT NULL, `text` TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS `messages_chat_id` ON `messages` (`chat_id`, `id`);
+INSERT INTO `messages` (`chat_id`, `member_id`, `sent_at`, `text`) SELECT `chats`.`id`, json_extract(`json_each`.`value`, '$.user_id'), CAST(strftime('%s', 'now') AS INTEGER), json_extract(`json_each`.`value`, '$.text') FROM `chats`, json_each(`chats`.`messages`) WHERE `chats`.`messages` != '[]' ORDER BY `chats`.`id`, `json_each`.`key`;
+UPDATE `chats` SET `messages` = '[]' WHERE `messages` != '[]';
@@ -0,0 +1,12 @@
+CREATE VIRTUAL TABLE IF NOT EXISTS `messages_search` USING fts5(`text`, content = 'messages', content_rowid = 'id');
+CREATE TRIGGER IF NOT EXISTS `messages_search_insert` AFTER INSERT ON `messages` BEGIN
+    INSERT INTO `messages_search` (`rowid`, `text`) VALUES (new.`id`, new.`text`);
+END;
+CREATE TRIGGER IF NOT EXISTS `messages_search_delete` AFTER DELETE ON `messages` BEGIN
+    INSERT INTO `messages_search` (`messages_search`, `rowid`, `text`) VALUES ('delete', old.`id`, old.`text`);
+END;
+CREATE TRIGGER IF NOT EXISTS `messages_search_update` AFTER UPDATE OF `text` ON `messages` BEGIN
+    INSERT INTO `messages_search` (`messages_search`, `rowid`, `text`) VALUES ('delete', old.`id`, old.`text`);
+    INSERT INTO `messages_search` (`rowid`, `text`) VALUES (new.`id`, new.`text`);
+END;
+INSERT INTO `messages_search` (`messages_search`) VALUES ('rebuild');
@@ -0,0 +1,12 @@
+ALTER TABLE `chats` ADD COLUMN `low_member_id` INTEGER;
+ALTER TABLE `chats` ADD COLUMN `high_member_id` INTEGER;
+CREATE TEMP TABLE `personal_chats` AS SELECT `chat_id`, MIN(`member_id`) AS `low_member_id`, MAX(`member_id`) AS `high_member_id` FROM `chat_members` GROUP BY `chat_id` HAVING COUNT(*) = 2;
+CREATE TEMP TABLE `duplicate_chats` AS SELECT `personal_chats`.`chat_id`, (SELECT MIN(`first`.`chat_id`) FROM `personal_chats` AS `first` WHERE `first`.`low_member_id` = `personal_chats`.`low_member_id` AND `first`.`high_member_id` = `personal_chats`.`high_member_id`) AS `kept_chat_id` FROM `personal_chats`;
+DELETE FROM `duplicate_chats` WHERE `chat_id` = `kept_chat_id`;
+UPDATE `messages` SET `chat_id` = (SELECT `kept_chat_id` FROM `duplicate_chats` WHERE `duplicate_chats`.`chat_id` = `messages`.`chat_id`) WHERE `chat_id` IN (SELECT `chat_id` FROM `duplicate_chats`);
+DELETE FROM `chat_members` WHERE `chat_id` IN (SELECT `chat_id` FROM `duplicate_chats`);
+DELETE FROM `chats` WHERE `id` IN (SELECT `chat_id` FROM `duplicate_chats`);
+UPDATE `chats` SET `low_member_id` = (SELECT `low_member_id` FROM `personal_chats` WHERE `personal_chats`.`chat_id` = `chats`.`id`), `high_member_id` = (SELECT `high_member_id` FROM `personal_chats` WHERE `personal_chats`.`chat_id` = `chats`.`id`) WHERE `id` IN (SELECT `chat_id` FROM `personal_chats`);
+CREATE UNIQUE INDEX IF NOT EXISTS `chats_personal_pair` ON `chats` (`low_member_id`, `high_member_id`) WHERE `low_member_id` IS NOT NULL;
+DROP TABLE `temp`.`personal_chats`;
+DROP TABLE `temp`.`duplicate_chats`;
@@ -0,0 +1 @@
+CREATE TABLE IF NOT EXISTS `class_welcomes` (`class_id` INTEGER NOT NULL, `member_id` INTEGER NOT NULL, `message_id` INTEGER NOT NULL, PRIMARY KEY (`class_id`, `member_id`));
@@ -0,0 +1,4 @@
+CREATE TABLE IF NOT EXISTS `enrollments` (`id` INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE NOT NULL, `class_id` INTEGER NOT NULL, `member_id` INTEGER NOT NULL, `enrolled_at` INTEGER NOT NULL, UNIQUE (`class_id`, `member_id`));
+CREATE INDEX IF NOT EXISTS `enrollments_member_id` ON `enrollments` (`member_id`, `class_id`);
+INSERT OR IGNORE INTO `enrollments` (`class_id`, `member_id`, `enrolled_at`) SELECT `classes`.`id`, CAST(`json_each`.`value` AS INTEGER), CAST(strftime('%s', 'now') AS INTEGER) FROM `classes`, json_each(`classes`.`applied_members`) WHERE `classes`.`applied_members` != '[]' ORDER BY `classes`.`id`, `json_each`.`key`;
+UPDATE `classes` SET `applied_members` = '[]' WHERE `applied_members` != '[]';
@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS `members_email` ON `members` (`email`);
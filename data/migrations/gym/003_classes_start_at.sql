@@ -0,0 +1,4 @@
+ALTER TABLE `classes` ADD COLUMN `start_at` INTEGER NOT NULL DEFAULT 0;
+UPDATE `classes` SET `start_at` = CAST(strftime('%s', `start_date`) AS INTEGER);
+CREATE INDEX IF NOT EXISTS `classes_start_at` ON `classes` (`start_at`);
+CREATE INDEX IF NOT EXISTS `classes_tutor_id_start_at` ON `classes` (`tutor_id`, `start_at`);
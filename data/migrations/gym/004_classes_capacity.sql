@@ -0,0 +1 @@
+ALTER TABLE `classes` ADD COLUMN `capacity` INTEGER;
@@ -0,0 +1 @@
+CREATE TABLE IF NOT EXISTS `pending_welcomes` (`class_id` INTEGER NOT NULL, `member_id` INTEGER NOT NULL, `tutor_id` INTEGER NOT NULL, `sent_at` INTEGER NOT NULL, `text` TEXT NOT NULL, PRIMARY KEY (`class_id`, `member_id`));
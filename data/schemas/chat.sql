@@ -1 +1 @@
-CREATE TABLE `chats` (`id` INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE NOT NULL, `members` TEXT NOT NULL, `messages` TEXT NOT NULL)
\ No newline at end of file
+CREATE TABLE IF NOT EXISTS `chats` (`id` INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE NOT NULL, `members` TEXT NOT NULL, `messages` TEXT NOT NULL);
\ No newline at end of file
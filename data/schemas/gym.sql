@@ -1,2 +1,2 @@
-CREATE TABLE `members` (`id` INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE NOT NULL, `forename` TEXT NOT NULL, `surname` TEXT NOT NULL, `email` TEXT NOT NULL, `phone` TEXT NOT NULL, `password` TEXT NOT NULL, `is_tutor` INTEGER NOT NULL, `profile` TEXT NOT NULL)
-CREATE TABLE `classes` (`id` INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE NOT NULL, `tutor_id` INTEGER NOT NULL, `applied_members` TEXT NOT NULL, `title` TEXT NOT NULL, `description` TEXT NOT NULL, `start_date` TEXT NOT NULL)
\ No newline at end of file
+CREATE TABLE IF NOT EXISTS `members` (`id` INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE NOT NULL, `forename` TEXT NOT NULL, `surname` TEXT NOT NULL, `email` TEXT NOT NULL, `phone` TEXT NOT NULL, `password` TEXT NOT NULL, `is_tutor` INTEGER NOT NULL, `profile` TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS `classes` (`id` INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE NOT NULL, `tutor_id` INTEGER NOT NULL, `applied_members` TEXT NOT NULL, `title` TEXT NOT NULL, `description` TEXT NOT NULL, `start_date` TEXT NOT NULL);
\ No newline at end of file
@@ -3,14 +3,16 @@ from PySide6.QtWidgets import QApplication
 
 # Local imports.
 from src.application.managers.font_manager import FontManager
-from src.application.managers.database_manager import DatabaseManager
+from src.application.managers.database_manager import DatabaseManager, ConnectionPool
+from src.application.managers.query_manager import QueryManager
+from src.application.managers.message_watcher import MessageWatcher
 from src.application.managers.colour_manager import ColourManager
 
 class Application(QApplication):
     def __init__(self):
         """Class object to handle attributes shared across the entire application."""
         super().__init__()
-    
+        
         self.load_managers()
         self.set_properties()
     
@@ -18,10 +20,23 @@ class Application(QApplication):
         """A function to load the managers into the application object; to avoid python cleaning."""
         self.font_manager = FontManager()
         self.database_manager = DatabaseManager # Don't initialise it!
+        self.connection_pool = ConnectionPool()
+        self.query_manager = QueryManager(self.connection_pool)
+        self.message_watcher = MessageWatcher(self.connection_pool)
         self.colour_manager = ColourManager()
+        
+        # Watch for new messages from other terminals, off the GUI thread.
+        self.message_watcher.start()
+        
+        # Stop watching, finish running queries and close every pooled database connection as the application quits.
+        self.aboutToQuit.connect(self.message_watcher.stop)
+        self.aboutToQuit.connect(self.query_manager.shutdown)
     
     def set_properties(self):
         """A function to set the properties of the managers to the application so they can be accessed within the application runtime."""
         self.setProperty("FontManager", self.font_manager)
         self.setProperty("DatabaseManager", self.database_manager)
+        self.setProperty("ConnectionPool", self.connection_pool)
+        self.setProperty("QueryManager", self.query_manager)
+        self.setProperty("MessageWatcher", self.message_watcher)
         self.setProperty("ColourManager", self.colour_manager)
\ No newline at end of file
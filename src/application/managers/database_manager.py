@@ -1,25 +1,876 @@
 # Python imports.
+import os
 import sqlite3
+import threading
+import json
+import sys
+import time
+from datetime import datetime
+from collections import OrderedDict, deque
+
+# Third-party imports.
+from PySide6.QtWidgets import QApplication
 
 # Object imports.
 from src.shared.objects import *
+from src.shared.funcs import path
+
+class DatabaseProfile:
+    # Profiles used when the settings file is missing or doesn't contain the requested profile.
+    default_profiles = {
+        "desktop": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -16000,
+            "mmap_size": 268435456,
+            "busy_timeout": 5000,
+            "temp_store": "MEMORY"
+        },
+        "kiosk": {
+            "journal_mode": "WAL",
+            "synchronous": "FULL",
+            "cache_size": -4000,
+            "mmap_size": 0,
+            "busy_timeout": 10000,
+            "temp_store": "DEFAULT"
+        },
+        "bulk_load": {
+            "journal_mode": "WAL",
+            "synchronous": "OFF",
+            "cache_size": -131072,
+            "mmap_size": 1073741824,
+            "busy_timeout": 30000,
+            "temp_store": "MEMORY"
+        }
+    }
+    
+    # PRAGMAs a profile is allowed to set, in the order they're applied.
+    pragmas = ["journal_mode", "synchronous", "cache_size", "mmap_size", "busy_timeout", "temp_store"]
+    
+    def __init__(self, name: str, settings: dict):
+        """A class object containing a named set of PRAGMAs applied to every connection that's opened.
+
+        Args:
+            name (str): Name of the profile, like desktop, kiosk or bulk_load.
+            settings (dict): PRAGMA names and the values to set them to.
+        """
+        self.name = name
+        self.settings = {pragma: settings[pragma] for pragma in self.pragmas if pragma in settings}
+    
+    @classmethod
+    def load(cls, name: str = None, settings_src: str = "/data/settings/database.json") -> "DatabaseProfile":
+        """A function to load a profile from the database settings file.
+
+        Args:
+            name (str, optional): Name of the profile to load, defaults to the profile selected in the settings file.
+            settings_src (str, optional): Path to the database settings file.
+
+        Returns:
+            DatabaseProfile: Loaded profile, falling back to the default profiles.
+        """
+        settings = {}
+        
+        if os.path.isfile(path(settings_src)):
+            with open(path(settings_src), "r") as file:
+                settings = json.load(file)
+        
+        if name is None:
+            name = settings.get("profile", "desktop")
+        
+        profiles = {**cls.default_profiles, **settings.get("profiles", {})}
+        
+        if name not in profiles:
+            print(f"Unknown database profile {name}, using desktop.")
+            
+            name = "desktop"
+        
+        return cls(name, profiles[name])
+    
+    def apply(self, connection: sqlite3.Connection):
+        """A function to apply the PRAGMAs of the profile to a connection.
+
+        Args:
+            connection (sqlite3.Connection): Connection to apply the profile to.
+        """
+        for pragma, value in self.settings.items():
+            connection.execute(f"PRAGMA {pragma} = {value}")
+    
+    def get_effective(self, connection: sqlite3.Connection) -> dict:
+        """A function to read back the values sqlite is actually using for the profile's PRAGMAs.
+
+        Args:
+            connection (sqlite3.Connection): Connection to read the values from.
+
+        Returns:
+            dict: PRAGMA names and their effective values.
+        """
+        return {pragma: connection.execute(f"PRAGMA {pragma}").fetchone()[0] for pragma in self.settings}
+
+class QueryRegistry:
+    def __init__(self, queries: dict[str, str]):
+        """A class object containing the named, parameterized statements used by the DatabaseManager.
+        
+        Because every statement text is fixed, sqlite3 prepares each one once per connection and reuses
+        it from the connection's statement cache afterwards, as long as the cache has room for them all.
+
+        Args:
+            queries (dict[str, str]): Names of the statements and their sql.
+        """
+        self.queries = queries
+    
+    def get(self, name: str) -> str:
+        """A function to get the sql of a named statement.
+
+        Args:
+            name (str): Name of the statement.
+
+        Returns:
+            str: SQL of the statement.
+        """
+        return self.queries[name]
+    
+    def get_cache_size(self) -> int:
+        """A function to get the statement cache size connections should be opened with.
+
+        Returns:
+            int: Room for every registered statement, plus sqlite3's default for anything else.
+        """
+        return len(self.queries) + 128
+
+query_registry = QueryRegistry({
+    # Members, the columns listed in the order Member takes them as it's created from a row by position.
+    "get_member_by_id": "SELECT id, forename, surname, email, phone, password, is_tutor, profile FROM members WHERE id = ?",
+    "get_member_by_email": "SELECT id, forename, surname, email, phone, password, is_tutor, profile FROM members WHERE email = ?",
+    "get_members": "SELECT id, forename, surname, email, phone, password, is_tutor, profile FROM members WHERE id IN (SELECT value FROM json_each(?))",
+    "add_member": "INSERT INTO members (forename, surname, email, phone, password, is_tutor, profile) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    
+    # Chats.
+    "get_member_chats": (
+        "SELECT chats.* FROM chat_members "
+        "JOIN chats ON chats.id = chat_members.chat_id "
+        "WHERE chat_members.member_id = ?"
+    ),
+    "get_chat": "SELECT * FROM chats WHERE id = ?",
+    "add_chat_member": "INSERT INTO chat_members (chat_id, member_id) VALUES (?, ?)",
+    # One-to-one chats are keyed by their lowest and highest member ID, a single probe of the unique pair index.
+    "get_personal_chat": "SELECT * FROM chats WHERE low_member_id = ? AND high_member_id = ?",
+    "add_personal_chat": (
+        "INSERT OR IGNORE INTO chats (members, messages, low_member_id, high_member_id) VALUES (?, '[]', ?, ?)"
+    ),
+    "get_sidebar_feed": (
+        "SELECT own.chat_id, other.member_id, substr(last_message.text, 1, 40), last_message.sent_at "
+        "FROM chat_members AS own "
+        "JOIN chat_members AS other ON other.chat_id = own.chat_id AND other.member_id != own.member_id "
+        "LEFT JOIN messages AS last_message ON last_message.id = ("
+        "SELECT MAX(messages.id) FROM messages WHERE messages.chat_id = own.chat_id"
+        ") "
+        "WHERE own.member_id = ? "
+        "ORDER BY COALESCE(last_message.sent_at, 0) DESC, own.chat_id DESC"
+    ),
+    "get_sidebar_chat": (
+        "SELECT own.chat_id, other.member_id, substr(last_message.text, 1, 40), last_message.sent_at "
+        "FROM chat_members AS own "
+        "JOIN chat_members AS other ON other.chat_id = own.chat_id AND other.member_id != own.member_id "
+        "LEFT JOIN messages AS last_message ON last_message.id = ("
+        "SELECT MAX(messages.id) FROM messages WHERE messages.chat_id = own.chat_id"
+        ") "
+        "WHERE own.member_id = ? AND own.chat_id = ?"
+    ),
+    
+    # Messages.
+    "add_message": "INSERT INTO messages (chat_id, member_id, sent_at, text) VALUES (?, ?, ?, ?)",
+    "get_chat_messages": "SELECT id, member_id, sent_at, text FROM messages WHERE chat_id = ? ORDER BY id",
+    "get_last_message_id": "SELECT COALESCE(MAX(id), 0) FROM messages",
+    "get_new_message_chats": "SELECT chat_id, MAX(id) FROM messages WHERE id > ? GROUP BY chat_id",
+    "get_messages_page": (
+        "SELECT id, member_id, sent_at, text FROM messages "
+        "WHERE chat_id = ? AND id < ? "
+        "ORDER BY id DESC LIMIT ?"
+    ),
+    "get_messages_page_after": (
+        "SELECT id, member_id, sent_at, text FROM messages "
+        "WHERE chat_id = ? AND id > ? "
+        "ORDER BY id LIMIT ?"
+    ),
+    "search_messages": (
+        "SELECT messages.id, messages.chat_id, messages.member_id, messages.sent_at, messages.text, "
+        "snippet(messages_search, 0, '[', ']', '...', 8) "
+        "FROM messages_search "
+        "JOIN messages ON messages.id = messages_search.rowid "
+        "JOIN chat_members ON chat_members.chat_id = messages.chat_id AND chat_members.member_id = ? "
+        "WHERE messages_search MATCH ? "
+        "ORDER BY messages_search.rank LIMIT ?"
+    ),
+    
+    # Classes.
+    "get_all_classes": "SELECT id, tutor_id, title, description, start_at FROM classes",
+    "get_class": "SELECT id, tutor_id, title, description, start_at FROM classes WHERE id = ?",
+    "get_classes": (
+        "SELECT id, tutor_id, title, description, start_at FROM classes "
+        "WHERE start_at >= ? AND start_at < ? "
+        "ORDER BY start_at, id LIMIT ? OFFSET ?"
+    ),
+    "get_tutor_classes": (
+        "SELECT id, tutor_id, title, description, start_at FROM classes "
+        "WHERE tutor_id = ? AND start_at >= ? AND start_at < ? "
+        "ORDER BY start_at, id LIMIT ? OFFSET ?"
+    ),
+    "add_enrollment": "INSERT OR IGNORE INTO enrollments (class_id, member_id, enrolled_at) VALUES (?, ?, ?)",
+    "is_member_enrolled": "SELECT 1 FROM enrollments WHERE class_id = ? AND member_id = ?",
+    "get_class_capacity": (
+        "SELECT capacity, (SELECT COUNT(*) FROM enrollments WHERE enrollments.class_id = classes.id) "
+        "FROM classes WHERE id = ?"
+    ),
+    "get_class_members": "SELECT member_id FROM enrollments WHERE class_id = ? ORDER BY id",
+    "get_member_classes": (
+        "SELECT classes.id, classes.tutor_id, classes.title, classes.description, classes.start_at FROM enrollments "
+        "JOIN classes ON classes.id = enrollments.class_id "
+        "WHERE enrollments.member_id = ?"
+    ),
+    
+    # Applying, run on the chat database with the gym database attached.
+    "get_class_application": (
+        "SELECT classes.tutor_id, classes.title, classes.start_at, classes.capacity, "
+        "(SELECT COUNT(*) FROM gym.enrollments WHERE enrollments.class_id = classes.id), "
+        "EXISTS (SELECT 1 FROM gym.enrollments WHERE enrollments.class_id = classes.id AND enrollments.member_id = ?) "
+        "FROM gym.classes WHERE classes.id = ?"
+    ),
+    "add_gym_enrollment": "INSERT INTO gym.enrollments (class_id, member_id, enrolled_at) VALUES (?, ?, ?)",
+    
+    # Welcomes owed by the gym database, kept until the chat database has the message.
+    "add_pending_welcome": (
+        "INSERT INTO gym.pending_welcomes (class_id, member_id, tutor_id, sent_at, text) VALUES (?, ?, ?, ?, ?)"
+    ),
+    "get_pending_welcome": (
+        "SELECT class_id, member_id, tutor_id, sent_at, text FROM gym.pending_welcomes WHERE class_id = ? AND member_id = ?"
+    ),
+    "get_pending_welcomes": "SELECT class_id, member_id, tutor_id, sent_at, text FROM gym.pending_welcomes",
+    "clear_pending_welcomes": (
+        "DELETE FROM gym.pending_welcomes WHERE EXISTS ("
+        "SELECT 1 FROM class_welcomes "
+        "WHERE class_welcomes.class_id = pending_welcomes.class_id AND class_welcomes.member_id = pending_welcomes.member_id"
+        ")"
+    ),
+    
+    # Welcomes sent, one per enrollment, so sending one again does nothing.
+    "is_class_welcome_sent": "SELECT 1 FROM class_welcomes WHERE class_id = ? AND member_id = ?",
+    "add_class_welcome": "INSERT INTO class_welcomes (class_id, member_id, message_id) VALUES (?, ?, ?)",
+    "delete_orphan_welcome_messages": (
+        "DELETE FROM messages WHERE id IN ("
+        "SELECT message_id FROM class_welcomes WHERE NOT EXISTS ("
+        "SELECT 1 FROM gym.enrollments "
+        "WHERE enrollments.class_id = class_welcomes.class_id AND enrollments.member_id = class_welcomes.member_id"
+        "))"
+    ),
+    "delete_orphan_class_welcomes": (
+        "DELETE FROM class_welcomes WHERE NOT EXISTS ("
+        "SELECT 1 FROM gym.enrollments "
+        "WHERE enrollments.class_id = class_welcomes.class_id AND enrollments.member_id = class_welcomes.member_id"
+        ")"
+    )
+})
+
+class QueryProfiler:
+    def __init__(self, enabled: bool = False, trace: bool = False, slow_query_ms: float = 50.0, slow_query_limit: int = 100):
+        """A class object recording how long each query run through the DatabaseManager takes, and where it was run from.
+        
+        Queries slower than the threshold are logged with their sql and query plan. With trace on, every statement
+        sqlite runs on a pooled connection is counted too, including ones the DatabaseManager doesn't run itself.
+        While disabled, the only cost to a query is checking the enabled flag.
+        
+        Args:
+            enabled (bool, optional): If queries are being recorded.
+            trace (bool, optional): If statements are captured with the connections' trace callback while enabled.
+            slow_query_ms (float, optional): Milliseconds a query has to take to be logged as slow.
+            slow_query_limit (int, optional): Most slow queries kept, the oldest are dropped first.
+        """
+        self.enabled = enabled
+        self.trace = trace
+        self.slow_query_ms = slow_query_ms
+        self.lock = threading.Lock()
+        
+        self.queries : dict[str, dict] = {} # Calls and timings of each named statement.
+        self.call_sites : dict[tuple[str, str], int] = {} # Calls of each named statement from each call site.
+        self.traced : dict[str, int] = {} # Traced statements counted by their first keyword.
+        self.recent_statements : deque[str] = deque(maxlen = 200)
+        self.slow_queries : deque[dict] = deque(maxlen = slow_query_limit)
+    
+    @classmethod
+    def load(cls, settings_src: str = "/data/settings/database.json") -> "QueryProfiler":
+        """A function to create a query profiler with the instrumentation settings in the database settings file.
+        
+        Args:
+            settings_src (str, optional): Path to the database settings file.
+        
+        Returns:
+            QueryProfiler: Query profiler, disabled unless the settings enable it.
+        """
+        settings = {}
+        
+        if os.path.isfile(path(settings_src)):
+            with open(path(settings_src), "r") as file:
+                settings = json.load(file)
+        
+        instrumentation = settings.get("instrumentation", {})
+        
+        return cls(
+            instrumentation.get("enabled", False),
+            instrumentation.get("trace", False),
+            instrumentation.get("slow_query_ms", 50.0),
+            instrumentation.get("slow_query_limit", 100)
+        )
+    
+    def set_enabled(self, enabled: bool, connection_pool: "ConnectionPool" = None):
+        """A function to turn recording on or off while the application is running.
+        
+        Args:
+            enabled (bool): If queries should be recorded.
+            connection_pool (ConnectionPool, optional): Pool whose open connections should start or stop being traced.
+        """
+        self.enabled = enabled
+        
+        if connection_pool is not None:
+            for connection in connection_pool.get_connections():
+                self.attach(connection)
+        
+        print(f"Query instrumentation {'enabled' if enabled else 'disabled'}.")
+    
+    def attach(self, connection: sqlite3.Connection):
+        """A function to set or clear the trace callback of a connection, depending on if tracing is on.
+        
+        Args:
+            connection (sqlite3.Connection): Connection to trace.
+        """
+        connection.set_trace_callback(self.trace_statement if self.enabled and self.trace else None)
+    
+    def trace_statement(self, statement: str):
+        """A function called by sqlite for every statement run on a traced connection.
+        
+        Args:
+            statement (str): SQL of the statement, with its parameters filled in.
+        """
+        keyword = statement.lstrip().split(" ", 1)[0].upper()
+        
+        with self.lock:
+            self.traced[keyword] = self.traced.get(keyword, 0) + 1
+            self.recent_statements.append(f"[{threading.current_thread().name}] {statement[:300]}")
+    
+    def execute(self, cursor: sqlite3.Cursor, name: str, query: str, parameters, many: bool = False) -> sqlite3.Cursor:
+        """A function to run a named statement, recording how long it took and where it was run from.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor to run the statement on.
+            name (str): Name of the statement.
+            query (str): SQL of the statement.
+            parameters (tuple | list[tuple]): Parameters bound to the statement, a list of them if many is True.
+            many (bool, optional): If the statement is run with executemany.
+        
+        Returns:
+            sqlite3.Cursor: Cursor of the executed statement.
+        """
+        call_site = self.get_call_site()
+        
+        started_at = time.perf_counter()
+        
+        if many is True:
+            result = cursor.executemany(query, parameters)
+        
+        else:
+            result = cursor.execute(query, parameters)
+        
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        
+        with self.lock:
+            stats = self.queries.setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            
+            self.call_sites[(name, call_site)] = self.call_sites.get((name, call_site), 0) + 1
+        
+        if elapsed_ms >= self.slow_query_ms:
+            self.log_slow_query(cursor.connection, name, query, parameters[0] if many and parameters else parameters, elapsed_ms, call_site)
+        
+        return result
+    
+    def get_call_site(self) -> str:
+        """A function to find which DatabaseManager function ran a query, and what called it.
+        
+        Returns:
+            str: Name of the DatabaseManager function, with the file, line and function that called it.
+        """
+        frame = sys._getframe(2) # DatabaseManager.execute, the profiler's caller.
+        method = frame.f_code.co_name
+        
+        # Walk out of the DatabaseManager, so a function calling another still reports the outer one.
+        while frame is not None and frame.f_code.co_filename == __file__:
+            method = frame.f_code.co_name
+            frame = frame.f_back
+        
+        if frame is None:
+            return method # Return early, nothing called the DatabaseManager.
+        
+        return f"{method} <- {os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} {frame.f_code.co_name}"
+    
+    def log_slow_query(self, connection: sqlite3.Connection, name: str, query: str, parameters: tuple, elapsed_ms: float, call_site: str):
+        """A function to log a slow query with the plan sqlite used for it.
+        
+        Args:
+            connection (sqlite3.Connection): Connection the query ran on.
+            name (str): Name of the statement.
+            query (str): SQL of the statement.
+            parameters (tuple): Parameters bound to the statement.
+            elapsed_ms (float): Milliseconds the query took.
+            call_site (str): Where the query was run from.
+        """
+        try:
+            plan = [fetch[3] for fetch in connection.execute(f"EXPLAIN QUERY PLAN {query}", parameters).fetchall()]
+        
+        except sqlite3.Error as error:
+            plan = [f"Unable to explain: {error}"]
+        
+        slow_query = {
+            "name": name,
+            "ms": round(elapsed_ms, 3),
+            "call_site": call_site,
+            "sql": query,
+            "plan": plan,
+            "logged_at": datetime.now().isoformat(timespec = "seconds")
+        }
+        
+        with self.lock:
+            self.slow_queries.append(slow_query)
+        
+        print(f"Slow query {name} took {elapsed_ms:.1f}ms from {call_site}: {plan}")
+    
+    def reset(self):
+        """A function to forget everything recorded so far."""
+        with self.lock:
+            self.queries.clear()
+            self.call_sites.clear()
+            self.traced.clear()
+            self.recent_statements.clear()
+            self.slow_queries.clear()
+    
+    def get_report(self) -> dict:
+        """A function to get everything recorded so far.
+        
+        Returns:
+            dict: Timings of each statement, calls from each call site, traced statements and slow queries.
+        """
+        with self.lock:
+            queries = sorted(self.queries.items(), key = lambda item: item[1]["total_ms"], reverse = True)
+            call_sites = sorted(self.call_sites.items(), key = lambda item: item[1], reverse = True)
+            
+            return {
+                "enabled": self.enabled,
+                "trace": self.trace,
+                "slow_query_ms": self.slow_query_ms,
+                "queries": {
+                    name: {**stats, "mean_ms": stats["total_ms"] / stats["calls"]} for name, stats in queries
+                },
+                "call_sites": [{"name": name, "call_site": call_site, "calls": calls} for (name, call_site), calls in call_sites],
+                "traced": dict(self.traced),
+                "recent_statements": list(self.recent_statements),
+                "slow_queries": list(self.slow_queries),
+                "member_cache": member_cache.get_stats()
+            }
+    
+    def dump(self, output_dir: str = "/data/logs") -> str:
+        """A function to print a summary of everything recorded so far, and write the full report to a json file.
+        
+        Args:
+            output_dir (str, optional): Directory the report is written to.
+        
+        Returns:
+            str: Path of the written report.
+        """
+        report = self.get_report()
+        
+        print(f"Query report, instrumentation {'enabled' if self.enabled else 'disabled'}:")
+        
+        for name, stats in list(report["queries"].items())[:15]:
+            print(f"  {name:<28} {stats['calls']:>6} calls {stats['total_ms']:>10.2f}ms total {stats['max_ms']:>8.2f}ms max")
+        
+        for call_site in report["call_sites"][:15]:
+            print(f"  {call_site['calls']:>6}x {call_site['name']}: {call_site['call_site']}")
+        
+        print(f"  {len(report['slow_queries'])} slow queries, traced statements: {report['traced']}")
+        
+        output_dir = path(output_dir)
+        os.makedirs(output_dir, exist_ok = True)
+        
+        output_src = os.path.join(output_dir, f"query_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        
+        with open(output_src, "w") as file:
+            json.dump(report, file, indent = 4)
+        
+        print(f"Query report written to {output_src}")
+        
+        return output_src
+
+query_profiler = QueryProfiler.load()
+
+class MemberCache:
+    def __init__(self, size: int = 1024):
+        """A class object mapping members to a single Member object each, so the same rows aren't fetched again and again.
+        
+        Members are keyed by their database and ID, the least recently used are dropped once the cache is full.
+        Writes to the members table through the DatabaseManager invalidate the members they change.
+        
+        Args:
+            size (int, optional): Most members kept, 0 turns the cache off.
+        """
+        self.size = size
+        self.members : OrderedDict[tuple[str, int], Member] = OrderedDict()
+        self.emails : dict[tuple[str, str], int] = {} # Email lookups mapped to member IDs.
+        self.lock = threading.Lock()
+        
+        # Statistics.
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    @classmethod
+    def load(cls, settings_src: str = "/data/settings/database.json") -> "MemberCache":
+        """A function to create a member cache with the size in the database settings file.
+        
+        Args:
+            settings_src (str, optional): Path to the database settings file.
+        
+        Returns:
+            MemberCache: Empty member cache.
+        """
+        settings = {}
+        
+        if os.path.isfile(path(settings_src)):
+            with open(path(settings_src), "r") as file:
+                settings = json.load(file)
+        
+        return cls(settings.get("member_cache", {}).get("size", 1024))
+    
+    def get(self, database_src: str, id: int = None, email: str = None) -> Member | None:
+        """A function to get a cached member by their ID or Email.
+        
+        Args:
+            database_src (str): Real path of the database the member is in.
+            id (int, optional): ID of the member.
+            email (str, optional): Email of the member.
+        
+        Returns:
+            Member | None: Cached member, None if they aren't cached.
+        """
+        with self.lock:
+            if email is not None:
+                id = self.emails.get((database_src, email))
+            
+            member = self.members.get((database_src, id))
+            
+            if member is None:
+                self.misses += 1
+                
+                return None # Return early, not cached.
+            
+            self.members.move_to_end((database_src, id)) # Most recently used.
+            self.hits += 1
+            
+            return member
+    
+    def put(self, database_src: str, member: Member) -> Member:
+        """A function to add a member to the cache, dropping the least recently used member if it's full.
+        
+        Args:
+            database_src (str): Real path of the database the member is in.
+            member (Member): Member to add.
+        
+        Returns:
+            Member: The cached Member object, which is the one already cached if another thread added it first.
+        """
+        if self.size <= 0:
+            return member # Return early, caching is off.
+        
+        with self.lock:
+            key = (database_src, member.id)
+            
+            if key in self.members:
+                self.members.move_to_end(key)
+                
+                return self.members[key] # Return early, keep a single object for the member.
+            
+            self.members[key] = member
+            self.emails[(database_src, member.email)] = member.id
+            
+            while len(self.members) > self.size:
+                (old_database_src, _), old_member = self.members.popitem(last = False)
+                self.emails.pop((old_database_src, old_member.email), None)
+            
+            return member
+    
+    def invalidate(self, database_src: str, id: int = None, email: str = None):
+        """A function to drop a member from the cache after they've been changed.
+        
+        Args:
+            database_src (str): Real path of the database the member is in.
+            id (int, optional): ID of the member.
+            email (str, optional): Email of the member.
+        """
+        with self.lock:
+            if email is not None:
+                id = self.emails.pop((database_src, email), id)
+            
+            member = self.members.pop((database_src, id), None)
+            
+            if member is not None:
+                self.emails.pop((database_src, member.email), None)
+                self.invalidations += 1
+    
+    def clear(self):
+        """A function to drop every cached member."""
+        with self.lock:
+            self.members.clear()
+            self.emails.clear()
+    
+    def get_stats(self) -> dict:
+        """A function to get the member cache statistics.
+        
+        Returns:
+            dict: Hit, miss and invalidation counts, with the hit rate and the amount of cached members.
+        """
+        with self.lock:
+            total = self.hits + self.misses
+            
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total > 0 else 0.0,
+                "invalidations": self.invalidations,
+                "members": len(self.members),
+                "size": self.size
+            }
+
+member_cache = MemberCache.load()
+
+class ConnectionPool:
+    def __init__(self, profile: DatabaseProfile = None):
+        """A class object handing out long-lived connections, one per database file and per thread.
+        
+        Connections are opened on first use and kept until close_thread or close_all is called,
+        so UI handlers can create a DatabaseManager per click without paying for a new connection.
+        
+        Args:
+            profile (DatabaseProfile, optional): Performance profile applied to each opened connection, defaults to the profile in the settings file.
+        """
+        self.profile = profile if profile is not None else DatabaseProfile.load()
+        self.connections : dict[tuple[str, int], sqlite3.Connection] = {}
+        self.lock = threading.Lock()
+        
+        # Statistics.
+        self.opened = 0
+        self.reused = 0
+        self.closed = 0
+    
+    def get_connection(self, database_src: str) -> sqlite3.Connection:
+        """A function to get the pooled connection of a database for the calling thread.
+
+        Args:
+            database_src (str): Path to the database.
+
+        Returns:
+            sqlite3.Connection: Connection to the database, owned by the calling thread.
+        """
+        key = (get_database_path(database_src), threading.get_ident())
+        
+        with self.lock:
+            connection = self.connections.get(key)
+            
+            if connection is not None:
+                self.reused += 1
+                
+                return connection # Return early, already open.
+        
+        # Connections are only ever used by the thread that opened them, checking is disabled so close_all can run from any thread.
+        connection = sqlite3.connect(
+            key[0],
+            check_same_thread = False,
+            cached_statements = query_registry.get_cache_size()
+        )
+        self.profile.apply(connection)
+        query_profiler.attach(connection)
+        
+        with self.lock:
+            self.connections[key] = connection
+            self.opened += 1
+        
+        return connection
+    
+    def get_connections(self) -> list[sqlite3.Connection]:
+        """A function to get every open pooled connection.
+        
+        Returns:
+            list[sqlite3.Connection]: Open connections of every thread.
+        """
+        with self.lock:
+            return list(self.connections.values())
+    
+    def close_thread(self):
+        """A function to commit and close every connection owned by the calling thread."""
+        thread_id = threading.get_ident()
+        
+        with self.lock:
+            keys = [key for key in self.connections if key[1] == thread_id]
+            connections = [self.connections.pop(key) for key in keys]
+        
+        for connection in connections:
+            self._close_connection(connection)
+    
+    def close_all(self):
+        """A function to commit and close every pooled connection, called as the application quits."""
+        with self.lock:
+            connections = list(self.connections.values())
+            self.connections.clear()
+        
+        for connection in connections:
+            self._close_connection(connection)
+        
+        print(f"Connection pool closed: {self.get_stats()}")
+        print(f"Member cache: {member_cache.get_stats()}")
+    
+    def _close_connection(self, connection: sqlite3.Connection):
+        """A function to commit and close a single connection.
+
+        Args:
+            connection (sqlite3.Connection): Connection to close.
+        """
+        connection.commit()
+        connection.close()
+        
+        with self.lock:
+            self.closed += 1
+    
+    def get_stats(self) -> dict:
+        """A function to get the statistics of the pool.
+
+        Returns:
+            dict: Opened, reused, closed and currently open connection counts, with the open count per database.
+        """
+        with self.lock:
+            databases : dict[str, int] = {}
+            for database_src, _ in self.connections:
+                databases[database_src] = databases.get(database_src, 0) + 1
+            
+            return {
+                "opened": self.opened,
+                "reused": self.reused,
+                "closed": self.closed,
+                "open": len(self.connections),
+                "profile": self.profile.name,
+                "databases": databases
+            }
+
+def get_database_path(database_src: str) -> str:
+    """A function to get the real path of a database, leaving paths that are already absolute unchanged.
+
+    Args:
+        database_src (str): Path to the database, relative to the application or absolute.
+
+    Returns:
+        str: Absolute path of the database.
+    """
+    if os.path.isabs(database_src):
+        return database_src # Already a real path, like the ones path() returns.
+    
+    return path(database_src)
+
+# Pool used when there isn't an application to own one, for example when seeding data.
+fallback_pool = ConnectionPool()
+
+def get_connection_pool() -> ConnectionPool:
+    """A function to get the connection pool owned by the application, or the fallback pool if there's no application.
+
+    Returns:
+        ConnectionPool: Connection pool to take connections from.
+    """
+    application = QApplication.instance()
+    
+    if application is not None:
+        connection_pool = application.property("ConnectionPool")
+        
+        if connection_pool is not None:
+            return connection_pool
+    
+    return fallback_pool
 
 class DatabaseManager:
-    def __init__(self, database_src: str):
+    def __init__(self, database_src: str, connection_pool: ConnectionPool = None):
         """A class object containing functions to handle query to and from a database from a given source.
 
         Args:
             database_src (str): Path to the database.
+            connection_pool (ConnectionPool, optional): Pool to take the connection from, defaults to the application pool.
         """
         self.database_src = database_src
+        self.connection_pool = connection_pool if connection_pool is not None else get_connection_pool()
         
-        self.connection = sqlite3.connect(self.database_src)
+        self.connection = self.connection_pool.get_connection(self.database_src)
         self.cursor = self.connection.cursor()
     
     def close(self):
-        """A function to commit and close the connection to the database."""
+        """A function to commit any changes, the connection itself stays open in the pool."""
         self.connection.commit()
-        self.connection.close()
+    
+    def execute(self, name: str, parameters: tuple = (), row_factory = None) -> sqlite3.Cursor:
+        """A function to execute a named statement from the query registry.
+
+        Args:
+            name (str): Name of the statement.
+            parameters (tuple, optional): Parameters bound to the statement.
+            row_factory (callable, optional): Creates an object from each fetched row, like Member.from_row, defaults to tuples.
+
+        Returns:
+            sqlite3.Cursor: Cursor of the executed statement.
+        """
+        query = query_registry.get(name)
+        
+        # Rows are built into objects as they're fetched, set for every statement so a factory never carries over.
+        self.cursor.row_factory = row_factory
+        
+        if query_profiler.enabled is False:
+            return self.cursor.execute(query, parameters)
+        
+        return query_profiler.execute(self.cursor, name, query, parameters)
+    
+    def executemany(self, name: str, parameters: list[tuple]) -> sqlite3.Cursor:
+        """A function to execute a named statement from the query registry once for each set of parameters.
+
+        Args:
+            name (str): Name of the statement.
+            parameters (list[tuple]): Parameters bound to each execution of the statement.
+
+        Returns:
+            sqlite3.Cursor: Cursor of the executed statement.
+        """
+        query = query_registry.get(name)
+        
+        self.cursor.row_factory = None
+        
+        if query_profiler.enabled is False:
+            return self.cursor.executemany(query, parameters)
+        
+        return query_profiler.execute(self.cursor, name, query, parameters, many = True)
+    
+    def attach(self, database_src: str, alias: str):
+        """A function to attach another database to the connection, so one query can read both.
+
+        Args:
+            database_src (str): Path to the database to attach.
+            alias (str): Name the attached database is referred to by in queries.
+        """
+        attached = [fetch[1] for fetch in self.connection.execute("PRAGMA database_list").fetchall()]
+        
+        if alias in attached:
+            return # Return early, the pooled connection already has it attached.
+        
+        self.connection.execute("ATTACH DATABASE ? AS ?", (get_database_path(database_src), alias))
     
     def get_member(self, id: int = None, email: str = None) -> Member | None:
         """A function to get a member from the database using their ID or Email.
@@ -31,17 +882,62 @@ class DatabaseManager:
         Returns:
             Member | None: If found a Member object is returned, if not - None is returned.
         """
-        extension = f"email = '{email}'" if email is not None else f"id = {id}"
-        query = f"SELECT * FROM members WHERE {extension}"
+        database_path = get_database_path(self.database_src)
         
-        self.cursor.execute(query)
-        fetch = self.cursor.fetchone()
+        # The same members are looked up again and again, so try the cache first.
+        cached_member = member_cache.get(database_path, id = id, email = email)
         
-        if fetch is None:
+        if cached_member is not None:
+            return cached_member # Return early, already fetched.
+        
+        if email is not None:
+            self.execute("get_member_by_email", (email,), Member.from_row)
+        
+        else:
+            self.execute("get_member_by_id", (id,), Member.from_row)
+        
+        member : Member | None = self.cursor.fetchone()
+        
+        if member is None:
             return None
         
-        # Create a member object and return it.
-        return Member(fetch[0], fetch[1], fetch[2], fetch[3], fetch[4], fetch[5], fetch[6], fetch[7])
+        # Cache the member and return it.
+        return member_cache.put(database_path, member)
+    
+    def get_members(self, ids: list[int]) -> dict[int, Member]:
+        """A function to get many members from the database in a single query.
+
+        Args:
+            ids (list[int]): IDs of the members.
+
+        Returns:
+            dict[int, Member]: Found members keyed by their ID, IDs that weren't found are left out.
+        """
+        database_path = get_database_path(self.database_src)
+        
+        # Take what's cached, only the rest is queried.
+        members : dict[int, Member] = {}
+        missing_ids : list[int] = []
+        
+        for id in set(int(id) for id in ids):
+            cached_member = member_cache.get(database_path, id = id)
+            
+            if cached_member is not None:
+                members[id] = cached_member
+            
+            else:
+                missing_ids.append(id)
+        
+        if missing_ids == []:
+            return members # Return early, every member was cached.
+        
+        # The IDs are bound as one json array, so the statement is the same however many there are.
+        self.execute("get_members", (json.dumps(missing_ids),), Member.from_row)
+        
+        for member in self.cursor.fetchall():
+            members[member.id] = member_cache.put(database_path, member)
+        
+        return members
     
     def add_member(self, member: Member) -> bool | Member:
         """A function to add a member to the members table.
@@ -52,11 +948,9 @@ class DatabaseManager:
         Returns:
             Member | None: If the member was added to the database successfully, it will return a Member object. if it isn't it will return False.
         """
-        query = "INSERT INTO members (forename, surname, email, phone, password, is_tutor, profile) VALUES (?, ?, ?, ?, ?, ?, ?)"
-        
-         # Add the user to the database.
-        self.cursor.execute(
-            query,
+        # Add the user to the database.
+        self.execute(
+            "add_member",
             (
                 member.forename, member.surname, member.email,
                 member.phone, member.password, 0, member.profile
@@ -66,6 +960,9 @@ class DatabaseManager:
         # Commit the insert.
         self.connection.commit()
         
+        # Drop anything cached under the email, the member has changed.
+        member_cache.invalidate(get_database_path(self.database_src), email = member.email)
+        
         # Check if the insert was successfully by attempting to get the user.
         fetched_member = self.get_member(email = member.email)
         
@@ -79,61 +976,269 @@ class DatabaseManager:
         return fetched_member
     
     def get_member_chats(self, member: Member) -> list:
-        member_id = member.id
-        self.cursor.execute(
-            f"SELECT * FROM chats WHERE members "
-            f"LIKE '%[{member_id},%'"
-            f"OR members LIKE '% {member_id},%'"
-            f"OR members LIKE '% {member_id}]%'"
-        ) # Search for all instances of the users ID.
+        """A function to get the chats a member is a part of.
+
+        Args:
+            member (Member): Member to get the chats of.
+
+        Returns:
+            list: Chat rows from the chats table.
+        """
+        self.execute("get_member_chats", (member.id,)) # Index lookup on the members chats.
         
         fetch = self.cursor.fetchall()
         
         return fetch
     
-    def add_message(self, chat: Chat, message: Message):
-        chat.messages.append(message) # Add the message to the chat.
+    def get_chat(self, chat_id: int) -> Chat | None:
+        """A function to get a chat from its ID.
+
+        Args:
+            chat_id (int): ID of the chat.
+
+        Returns:
+            Chat | None: If found a Chat object is returned, if not - None is returned.
+        """
+        self.execute("get_chat", (chat_id,), Chat.from_row)
+        
+        return self.cursor.fetchone()
+    
+    def get_sidebar_feed(self, member: Member, gym_database_src: str = "data/gym.sqlite") -> list[SidebarChat]:
+        """A function to get what the chat sidebar shows for a member in a single query.
         
-        message_dicts : list[dict] = [] # Moving the messages to a dictionary to add to database.
-        for message in chat.messages:
-            message_dicts.append({"user_id": message.member.id, "text": message.text})
+        Each chat comes back with the other member, a snippet of the last message and when it was sent,
+        without loading any history. The other members are then looked up together through the member cache.
+
+        Args:
+            member (Member): Member the sidebar belongs to.
+            gym_database_src (str, optional): Path to the gym database holding the members.
+
+        Returns:
+            list[SidebarChat]: The member's chats, most recently active first.
+        """
+        rows = self.execute("get_sidebar_feed", (member.id,)).fetchall()
         
-        # Convert message dicts to json form.
-        json_string = json.dumps(message_dicts)
+        return self._create_sidebar_chats(rows, gym_database_src)
+    
+    def get_sidebar_chat(self, member: Member, chat_id: int, gym_database_src: str = "data/gym.sqlite") -> SidebarChat | None:
+        """A function to get what the chat sidebar shows for a single chat, used to update one button when it changes.
         
-        # Add the new json data to the chat in the database.
-        self.cursor.execute(f"UPDATE chats SET messages = ? WHERE id = ?", (json_string, chat.id))
-        self.connection.commit()
+        Args:
+            member (Member): Member the sidebar belongs to.
+            chat_id (int): ID of the chat.
+            gym_database_src (str, optional): Path to the gym database holding the members.
         
-    def create_chat(self, sender: Member, receiver: Member) -> Chat:
-        """A function to create a chat between two users."""
-        sender_id = sender.id
-        receiver_id = receiver.id
+        Returns:
+            SidebarChat | None: The chat as the sidebar shows it, None if the member isn't in the chat.
+        """
+        rows = self.execute("get_sidebar_chat", (member.id, chat_id)).fetchall()
+        
+        sidebar_chats = self._create_sidebar_chats(rows, gym_database_src)
         
-        members = [sender_id, receiver_id]
-        messages = []
+        return sidebar_chats[0] if sidebar_chats != [] else None
+    
+    def _get_members_by_id(self, member_ids: list[int], gym_database_src: str) -> dict[int, Member]:
+        """A function to get the members of rows from the chat database, through the member cache so each is only created once.
+        
+        Args:
+            member_ids (list[int]): IDs of the members, repeats are only looked up once.
+            gym_database_src (str): Path to the gym database holding the members.
+        
+        Returns:
+            dict[int, Member]: Found members keyed by their ID.
+        """
+        if member_ids == []:
+            return {} # Return early, nothing to look up.
+        
+        return DatabaseManager(gym_database_src, self.connection_pool).get_members(member_ids)
+    
+    def _create_sidebar_chats(self, rows: list[tuple], gym_database_src: str) -> list[SidebarChat]:
+        """A function to create sidebar chats from rows of (chat_id, member_id, snippet, sent_at).
         
-        self.cursor.execute("INSERT INTO chats (members, messages) VALUES (?, ?)", (str(members), str(messages)))
+        Args:
+            rows (list[tuple]): Rows of the sidebar queries.
+            gym_database_src (str): Path to the gym database holding the members.
+        
+        Returns:
+            list[SidebarChat]: Sidebar chats of the rows, leaving out any whose other member no longer exists.
+        """
+        members_by_id = self._get_members_by_id([row[1] for row in rows], gym_database_src)
+        
+        return [
+            SidebarChat(chat_id, members_by_id[member_id], snippet, datetime.fromtimestamp(sent_at) if sent_at is not None else None)
+            for chat_id, member_id, snippet, sent_at in rows
+            if member_id in members_by_id
+        ]
+    
+    def add_message(self, chat: Chat, message: Message) -> int:
+        """A function to add a message to a chat, stored as a single row in the messages table.
+
+        Args:
+            chat (Chat): Chat the message is being sent to.
+            message (Message): Message being sent.
+
+        Returns:
+            int: ID of the stored message.
+        """
+        chat.append_message(message) # Add the message to the chat, if its history is loaded.
+        
+        self.execute(
+            "add_message",
+            (chat.id, message.member.id, int(message.sent_at.timestamp()), message.text)
+        )
         self.connection.commit()
+        
+        message.id = self.cursor.lastrowid
+        
+        return message.id
     
-    def get_personal_chat(self, member_1: Member, member_2: Member) -> Chat:
-        """A function to get any chat that has just two members."""
-        member_1_id = member_1.id
-        member_2_id = member_2.id
+    def get_chat_messages(self, chat_id: int) -> list[tuple]:
+        """A function to get every message of a chat in the order they were sent.
+
+        Args:
+            chat_id (int): ID of the chat.
+
+        Returns:
+            list[tuple]: Message rows of (id, member_id, sent_at, text).
+        """
+        self.execute("get_chat_messages", (chat_id,))
         
-        self.cursor.execute(
-            f"SELECT * FROM chats WHERE members "
-            f"LIKE '[{member_1_id}, {member_2_id}]'"
-            f"OR members LIKE '[{member_2_id}, {member_1_id}]'"
-        ) # Search for all instances of the users ID.
+        return self.cursor.fetchall()
         
-        fetch = self.cursor.fetchone()
+    def get_messages(
+            self,
+            chat_id: int,
+            before_id: int = None,
+            after_id: int = None,
+            limit: int = 50,
+            gym_database_src: str = "data/gym.sqlite"
+    ) -> list[Message]:
+        """A function to get a page of messages from a chat, using the (chat_id, id) index to seek straight to it.
         
-        if fetch is not None:
-            return Chat(fetch)
+        Pages are found by message ID rather than an offset, so loading a page costs the same however long the chat is.
 
+        Args:
+            chat_id (int): ID of the chat.
+            before_id (int, optional): Only get messages older than this message ID, defaults to the newest messages.
+            after_id (int, optional): Only get messages newer than this message ID, used instead of before_id.
+            limit (int, optional): Most messages to get.
+            gym_database_src (str, optional): Path to the gym database holding the members.
+
+        Returns:
+            list[Message]: Messages in the order they were sent, the newest last.
+        """
+        if after_id is not None:
+            self.execute("get_messages_page_after", (chat_id, after_id, limit))
+        
         else:
-            return None
+            if before_id is None:
+                before_id = 9223372036854775807 # Largest ID sqlite can store, to keep one statement for every page.
+            
+            self.execute("get_messages_page", (chat_id, before_id, limit))
+        
+        rows = self.cursor.fetchall()
+        
+        if after_id is None:
+            rows.reverse() # Newest were fetched first.
+        
+        # Every message from the same sender shares one cached member.
+        members_by_id = self._get_members_by_id([row[1] for row in rows], gym_database_src)
+        
+        return [
+            Message(members_by_id[member_id], text, message_id, datetime.fromtimestamp(sent_at))
+            for message_id, member_id, sent_at, text in rows
+            if member_id in members_by_id
+        ]
+    
+    def search_messages(self, member: Member, text: str, limit: int = 20, gym_database_src: str = "data/gym.sqlite") -> list[SearchResult]:
+        """A function to search the messages of every chat a member is a part of, using the full-text index.
+
+        Args:
+            member (Member): Member searching, only their chats are searched.
+            text (str): Text to search for, the last word matches as a prefix so results show while typing.
+            limit (int, optional): Most results to get.
+            gym_database_src (str, optional): Path to the gym database holding the members.
+
+        Returns:
+            list[SearchResult]: Matching messages, best match first.
+        """
+        # Quote every word so anything typed is searched for as text rather than as query syntax.
+        words = ["\"" + word.replace("\"", "\"\"") + "\"" for word in text.split()]
+        
+        if words == []:
+            return [] # Return early, nothing to search for.
+        
+        words[-1] += "*"
+        
+        rows = self.execute("search_messages", (member.id, " ".join(words), limit)).fetchall()
+        
+        members_by_id = self._get_members_by_id([row[2] for row in rows], gym_database_src)
+        
+        return [
+            SearchResult(chat_id, Message(members_by_id[member_id], text, message_id, datetime.fromtimestamp(sent_at)), snippet)
+            for message_id, chat_id, member_id, sent_at, text, snippet in rows
+            if member_id in members_by_id
+        ]
+    
+    def create_chat(self, sender: Member, receiver: Member) -> Chat:
+        """A function to create a chat between two users, or get the one they already have.
+        
+        Args:
+            sender (Member): Member starting the chat.
+            receiver (Member): Member the chat is with.
+        
+        Returns:
+            Chat: Chat between the two members.
+        """
+        return self.get_or_create_personal_chat(sender, receiver)[0]
+    
+    def get_personal_chat(self, member_1: Member, member_2: Member) -> Chat | None:
+        """A function to get the one-to-one chat between two members.
+        
+        Args:
+            member_1 (Member): One of the members, in either order.
+            member_2 (Member): The other member.
+        
+        Returns:
+            Chat | None: If found a Chat object is returned, if not - None is returned.
+        """
+        pair = sorted([member_1.id, member_2.id]) # The same key whichever member is given first.
+        
+        self.execute("get_personal_chat", (pair[0], pair[1]), Chat.from_row)
+        
+        return self.cursor.fetchone()
+    
+    def get_or_create_personal_chat(self, member_1: Member, member_2: Member) -> tuple[Chat, bool]:
+        """A function to get the one-to-one chat between two members, creating it if they don't have one.
+        
+        The unique pair index decides which of two racing creations wins, the other gets the winner's chat.
+        
+        Args:
+            member_1 (Member): Member starting the chat, listed first.
+            member_2 (Member): Member the chat is with.
+        
+        Returns:
+            tuple[Chat, bool]: Chat between the two members, and True if it was created by this call.
+        """
+        personal_chat = self.get_personal_chat(member_1, member_2)
+        
+        if personal_chat is not None:
+            return personal_chat, False # Return early, already chatting.
+        
+        pair = sorted([member_1.id, member_2.id])
+        
+        self.execute("add_personal_chat", (str([member_1.id, member_2.id]), pair[0], pair[1]))
+        created = self.cursor.rowcount == 1 # Ignored if another terminal made the chat first.
+        
+        if created:
+            chat_id = self.cursor.lastrowid
+            
+            # Add the members to the membership table.
+            self.executemany("add_chat_member", [(chat_id, member_1.id), (chat_id, member_2.id)])
+        
+        self.connection.commit()
+        
+        return self.get_personal_chat(member_1, member_2), created
     
     def get_all_classes(self) -> list[AvailableClass]:
         """A function to retrieve all available classes from the database as a list of class objects.
@@ -141,71 +1246,288 @@ class DatabaseManager:
         Returns:
             list[AvailableClass]: An object containing data related to the available class.
         """
-        self.cursor.execute("SELECT * FROM classes")
-        fetch = self.cursor.fetchall()
+        self.execute("get_all_classes", row_factory = AvailableClass.from_row)
         
-        available_classes : list[AvailableClass] = []
-        for fetch_data in fetch:
-            class_data = {
-                "id": fetch_data[0],
-                "tutor_id": fetch_data[1],
-                "applied_members": fetch_data[2],
-                "title": fetch_data[3],
-                "description": fetch_data[4],
-                "start_date": fetch_data[5]
-            }
-            
-            available_classes.append(AvailableClass(class_data))
+        return self.cursor.fetchall()
+    
+    def get_classes(
+            self,
+            start_from: datetime = None,
+            start_to: datetime = None,
+            tutor_id: int = None,
+            limit: int = 50,
+            offset: int = 0
+    ) -> list[AvailableClass]:
+        """A function to get a page of classes starting within a time range, using the start time index.
+
+        Args:
+            start_from (datetime, optional): Earliest start time, defaults to no limit.
+            start_to (datetime, optional): Start time classes must start before, defaults to no limit.
+            tutor_id (int, optional): Only get the classes of this tutor.
+            limit (int, optional): Most classes to get.
+            offset (int, optional): Amount of classes to skip, for later pages.
+
+        Returns:
+            list[AvailableClass]: Classes in the order they start.
+        """
+        start_from_epoch = to_epoch(start_from) if start_from is not None else -9223372036854775808
+        start_to_epoch = to_epoch(start_to) if start_to is not None else 9223372036854775807
+        
+        if tutor_id is not None:
+            self.execute("get_tutor_classes", (tutor_id, start_from_epoch, start_to_epoch, limit, offset), AvailableClass.from_row)
+        
+        else:
+            self.execute("get_classes", (start_from_epoch, start_to_epoch, limit, offset), AvailableClass.from_row)
         
-        return available_classes
+        return self.cursor.fetchall()
     
     def get_class(self, class_id: int) -> AvailableClass:
-        self.cursor.execute(f"SELECT * FROM classes WHERE id = {class_id}")
-        fetch_data = self.cursor.fetchone()
-        
-        class_data = {
-            "id": fetch_data[0],
-            "tutor_id": fetch_data[1],
-            "applied_members": fetch_data[2],
-            "title": fetch_data[3],
-            "description": fetch_data[4],
-            "start_date": fetch_data[5]
-        }
+        self.execute("get_class", (class_id,), AvailableClass.from_row)
         
-        return AvailableClass(class_data)
+        return self.cursor.fetchone()
     
-    def add_member_to_class(self, adding_member: Member, adding_class: AvailableClass):
-        # Get current members.
-        self.cursor.execute(f"SELECT * FROM classes WHERE id = {adding_class.id}")
-        fetch = self.cursor.fetchone()
+    def enroll(self, member_id: int, class_id: int) -> EnrollmentResult | None:
+        """A function to enroll a member into a class as one atomic operation, safe against other terminals enrolling at the same time.
+        
+        The write lock is taken with BEGIN IMMEDIATE before anything is read, so no other connection can enroll
+        anyone between checking the class has space and adding the enrollment.
+
+        Args:
+            member_id (int): ID of the member being enrolled.
+            class_id (int): ID of the class the member is being enrolled into.
+
+        Returns:
+            EnrollmentResult | None: ENROLLED, ALREADY_ENROLLED or FULL, None if the class doesn't exist.
+        """
+        if self.connection.in_transaction:
+            self.connection.commit() # Finish anything pending, a transaction can't be started inside another.
         
-        class_members : list = ast.literal_eval(fetch[2])
-        class_members.append(adding_member.id)
+        self.connection.execute("BEGIN IMMEDIATE") # Waits up to the profile's busy_timeout while another terminal writes.
+        
+        try:
+            self.execute("get_class_capacity", (class_id,))
+            fetch = self.cursor.fetchone()
+            
+            if fetch is None:
+                result = None # No class to enroll into.
+            
+            elif self.execute("is_member_enrolled", (class_id, member_id)).fetchone() is not None:
+                result = EnrollmentResult.ALREADY_ENROLLED
+            
+            elif fetch[0] is not None and fetch[1] >= fetch[0]:
+                result = EnrollmentResult.FULL # A capacity of NULL means there's no limit.
+            
+            else:
+                self.execute("add_enrollment", (class_id, member_id, int(datetime.now().timestamp())))
+                result = EnrollmentResult.ENROLLED
+        
+        except BaseException:
+            self.connection.rollback()
+            
+            raise
         
-        # Add the new list to the database.
-        self.cursor.execute("UPDATE classes SET applied_members = ? WHERE id = ?", (str(class_members), adding_class.id))
         self.connection.commit()
+        
+        return result
     
-    def get_member_classes(self, member: Member) -> list[AvailableClass]:
-        self.cursor.execute(
-            f"SELECT * FROM classes WHERE applied_members "
-            f"LIKE '%[{member.id},%'"
-            f"OR applied_members LIKE '% {member.id},%'"
-            f"OR applied_members LIKE '% {member.id}]%'"
-        ) # Search for all instances of the users ID.
-        fetches = self.cursor.fetchall()
-        
-        classes : list[AvailableClass] = []
-        for fetch in fetches:
-            class_data = {
-                "id": fetch[0],
-                "tutor_id": fetch[1],
-                "applied_members": fetch[2],
-                "title": fetch[3],
-                "description": fetch[4],
-                "start_date": fetch[5]
-            }
+    def add_member_to_class(self, adding_member: Member, adding_class: AvailableClass) -> EnrollmentResult | None:
+        """A function to enroll a member into a class, doing nothing if they're already enrolled or it's full.
+
+        Args:
+            adding_member (Member): Member being enrolled.
+            adding_class (AvailableClass): Class the member is being enrolled into.
+        
+        Returns:
+            EnrollmentResult | None: Outcome of the enrollment, None if the class doesn't exist.
+        """
+        return self.enroll(adding_member.id, adding_class.id)
+    
+    def apply_to_class(
+            self,
+            member: Member,
+            class_id: int,
+            welcome_text: str,
+            gym_database_src: str = "data/gym.sqlite"
+    ) -> EnrollmentResult | None:
+        """A function to enroll a member into a class and have the tutor welcome them in their chat, as a single transaction.
+        
+        Run on the chat database, the gym database is attached so the enrollment, the chat and the message are all
+        written by one connection and committed together, or not at all if anything fails.
+        
+        Both databases use WAL, where sqlite commits each attached file on its own, so a crash during the commit can
+        keep one database's changes without the other's. The welcome is written to the gym database's pending_welcomes
+        along with the enrollment and only cleared once the chat database has it, so whatever is left half sent is
+        finished by applying again or by recover_class_welcomes as the application starts.
+        
+        Args:
+            member (Member): Member applying to the class.
+            class_id (int): ID of the class being applied to.
+            welcome_text (str): Message the tutor sends, formatted with {forename}, {title} and {start_date}.
+            gym_database_src (str, optional): Path to the gym database holding the classes.
+        
+        Returns:
+            EnrollmentResult | None: ENROLLED, ALREADY_ENROLLED or FULL, None if the class doesn't exist.
+        """
+        if self.connection.in_transaction:
+            self.connection.commit() # Finish anything pending, a transaction can't be started inside another.
+        
+        self.attach(gym_database_src, "gym") # Can't be attached once the transaction has started.
+        
+        # Takes the write lock on both databases, so nobody can enroll between the checks and the insert.
+        self.connection.execute("BEGIN IMMEDIATE")
+        
+        try:
+            self.execute("get_class_application", (member.id, class_id))
+            fetch = self.cursor.fetchone()
+            
+            if fetch is None:
+                result = None # No class to apply to.
+            
+            elif fetch[5] == 1:
+                result = EnrollmentResult.ALREADY_ENROLLED
+                
+                # Retry a welcome an earlier application didn't finish sending.
+                self.execute("get_pending_welcome", (class_id, member.id))
+                pending_welcome = self.cursor.fetchone()
+                
+                if pending_welcome is not None:
+                    self._send_class_welcome(*pending_welcome)
+            
+            elif fetch[3] is not None and fetch[4] >= fetch[3]:
+                result = EnrollmentResult.FULL # A capacity of NULL means there's no limit.
+            
+            else:
+                tutor_id, title, start_at = fetch[0], fetch[1], fetch[2]
+                sent_at = int(datetime.now().timestamp())
+                
+                self.execute("add_gym_enrollment", (class_id, member.id, sent_at))
+                
+                # Tutors don't message themselves.
+                if tutor_id != member.id:
+                    text = welcome_text.format(
+                        forename = member.forename.capitalize(),
+                        title = title,
+                        start_date = str(from_epoch(start_at))
+                    )
+                    
+                    self.execute("add_pending_welcome", (class_id, member.id, tutor_id, sent_at, text))
+                    self._send_class_welcome(class_id, member.id, tutor_id, sent_at, text)
+                
+                result = EnrollmentResult.ENROLLED
+        
+        except BaseException:
+            self.connection.rollback()
+            
+            raise
+        
+        self.connection.commit()
+        
+        # Only cleared once the message is committed, so a welcome is never dropped before it's sent.
+        self.execute("clear_pending_welcomes")
+        self.connection.commit()
+        
+        return result
+    
+    def _send_class_welcome(self, class_id: int, member_id: int, tutor_id: int, sent_at: int, text: str):
+        """A function to send a member the welcome to a class from its tutor, doing nothing if it has already been sent.
+        
+        Called inside a transaction on the chat database.
+        
+        Args:
+            class_id (int): ID of the class the member applied to.
+            member_id (int): ID of the member being welcomed.
+            tutor_id (int): ID of the tutor sending the welcome.
+            sent_at (int): Time the member applied, as seconds since the epoch.
+            text (str): Text of the welcome.
+        """
+        if self.execute("is_class_welcome_sent", (class_id, member_id)).fetchone() is not None:
+            return # Return early, already sent.
+        
+        # Reuse the chat with the tutor if there already is one.
+        pair = sorted([member_id, tutor_id])
+        
+        self.execute("get_personal_chat", (pair[0], pair[1]))
+        chat = self.cursor.fetchone()
+        
+        if chat is not None:
+            chat_id = chat[0]
+        
+        else:
+            self.execute("add_personal_chat", (str([member_id, tutor_id]), pair[0], pair[1]))
+            chat_id = self.cursor.lastrowid
+            
+            self.executemany("add_chat_member", [(chat_id, member_id), (chat_id, tutor_id)])
+        
+        self.execute("add_message", (chat_id, tutor_id, sent_at, text))
+        self.execute("add_class_welcome", (class_id, member_id, self.cursor.lastrowid))
+    
+    def recover_class_welcomes(self, gym_database_src: str = "data/gym.sqlite") -> int:
+        """A function to finish any class application a crash left half committed, run on the chat database as the application starts.
+        
+        Welcomes still pending in the gym database are sent, and welcomes whose enrollment was never committed are removed.
+        
+        Args:
+            gym_database_src (str, optional): Path to the gym database holding the enrollments.
+        
+        Returns:
+            int: Welcomes that were still pending.
+        """
+        if self.connection.in_transaction:
+            self.connection.commit() # Finish anything pending, a transaction can't be started inside another.
+        
+        self.attach(gym_database_src, "gym")
+        
+        self.connection.execute("BEGIN IMMEDIATE")
+        
+        try:
+            pending_welcomes = self.execute("get_pending_welcomes").fetchall()
             
-            classes.append(AvailableClass(class_data))
+            for pending_welcome in pending_welcomes:
+                self._send_class_welcome(*pending_welcome)
+            
+            self.execute("delete_orphan_welcome_messages")
+            self.execute("delete_orphan_class_welcomes")
+        
+        except BaseException:
+            self.connection.rollback()
+            
+            raise
+        
+        self.connection.commit()
+        
+        self.execute("clear_pending_welcomes")
+        self.connection.commit()
+        
+        return len(pending_welcomes)
+    
+    def is_member_enrolled(self, member: Member, available_class: AvailableClass) -> bool:
+        """A function to check if a member is enrolled into a class.
+
+        Args:
+            member (Member): Member to check.
+            available_class (AvailableClass): Class to check.
+
+        Returns:
+            bool: True if the member is enrolled, False if not.
+        """
+        self.execute("is_member_enrolled", (available_class.id, member.id))
+        
+        return self.cursor.fetchone() is not None
+    
+    def get_class_members(self, available_class: AvailableClass) -> list[int]:
+        """A function to get the IDs of every member enrolled into a class.
+
+        Args:
+            available_class (AvailableClass): Class to get the members of.
+
+        Returns:
+            list[int]: IDs of the enrolled members, in the order they enrolled.
+        """
+        self.execute("get_class_members", (available_class.id,))
+        
+        return [fetch[0] for fetch in self.cursor.fetchall()]
+    
+    def get_member_classes(self, member: Member) -> list[AvailableClass]:
+        self.execute("get_member_classes", (member.id,), AvailableClass.from_row) # Index lookup on the members enrollments.
         
-        return classes
\ No newline at end of file
+        return self.cursor.fetchall()
\ No newline at end of file
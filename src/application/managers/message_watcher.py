@@ -0,0 +1,111 @@
+# Third-party imports.
+from PySide6.QtCore import QObject, QThread, QTimer, Signal, Slot
+
+# Local imports.
+from src.application.managers.database_manager import DatabaseManager, ConnectionPool
+
+class MessagePoller(QObject):
+    # Emitted on the watcher thread with the ID of a chat and the newest message ID seen before it changed.
+    new_messages = Signal(int, int)
+    
+    def __init__(self, database_src: str, connection_pool: ConnectionPool, interval_ms: int):
+        """A class object polling the chat database for new messages, living on the watcher thread.
+        
+        Args:
+            database_src (str): Path to the chat database.
+            connection_pool (ConnectionPool): Pool the watcher thread takes its connection from.
+            interval_ms (int): Milliseconds between each poll.
+        """
+        super().__init__()
+        self.database_src = database_src
+        self.connection_pool = connection_pool
+        self.interval_ms = interval_ms
+        
+        self.database : DatabaseManager = None
+        self.timer : QTimer = None
+        self.data_version : int = None
+        self.last_message_id : int = None
+    
+    @Slot()
+    def start(self):
+        """A function to open the connection and start polling, called once the watcher thread has started."""
+        # Made here so the connection belongs to the watcher thread.
+        self.database = DatabaseManager(self.database_src, self.connection_pool)
+        
+        self.data_version = self.get_data_version()
+        self.last_message_id = self.database.execute("get_last_message_id").fetchone()[0]
+        
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+        self.timer.start(self.interval_ms)
+    
+    @Slot()
+    def stop(self):
+        """A function to stop polling, called on the watcher thread as it finishes."""
+        if self.timer is not None:
+            self.timer.stop()
+    
+    @Slot()
+    def poll(self):
+        """A function to check for new messages, only querying them if another connection has committed since the last poll."""
+        data_version = self.get_data_version()
+        
+        if data_version == self.data_version:
+            return # Return early, nothing has been committed.
+        
+        self.data_version = data_version
+        
+        since_id = self.last_message_id
+        
+        # Every chat with messages newer than the last poll, found from the message ID range.
+        for chat_id, newest_id in self.database.execute("get_new_message_chats", (since_id,)).fetchall():
+            self.last_message_id = max(self.last_message_id, newest_id)
+            
+            self.new_messages.emit(chat_id, since_id)
+    
+    def get_data_version(self) -> int:
+        """A function to get the data version of the connection, which changes whenever another connection commits.
+        
+        Returns:
+            int: Data version of the connection.
+        """
+        return self.database.connection.execute("PRAGMA data_version").fetchone()[0]
+
+class MessageWatcher(QObject):
+    # Emitted on the GUI thread with the ID of a chat and the newest message ID seen before it changed.
+    new_messages = Signal(int, int)
+    
+    def __init__(self, connection_pool: ConnectionPool, database_src: str = "data/chat.sqlite", interval_ms: int = 250):
+        """A class object watching the chat database off the GUI thread, announcing which chats have new messages.
+        
+        While nothing changes each poll is a single PRAGMA data_version, messages are only queried once something
+        has been committed, whether by this application or another terminal.
+        
+        Args:
+            connection_pool (ConnectionPool): Pool the watcher thread takes its connection from.
+            database_src (str, optional): Path to the chat database.
+            interval_ms (int, optional): Milliseconds between each poll.
+        """
+        super().__init__()
+        
+        self.watcher_thread = QThread()
+        self.poller = MessagePoller(database_src, connection_pool, interval_ms)
+        self.poller.moveToThread(self.watcher_thread)
+        
+        self.watcher_thread.started.connect(self.poller.start)
+        self.watcher_thread.finished.connect(self.poller.stop) # Emitted on the watcher thread, which owns the timer.
+        
+        # Queued over to the GUI thread, where the watcher lives.
+        self.poller.new_messages.connect(self.new_messages)
+    
+    def start(self):
+        """A function to start watching for new messages."""
+        self.watcher_thread.start()
+    
+    def stop(self):
+        """A function to stop watching and wait for the watcher thread to finish, called as the application quits."""
+        if self.watcher_thread.isRunning() is False:
+            return # Return early, never started.
+        
+        self.watcher_thread.quit()
+        self.watcher_thread.wait()
@@ -0,0 +1,204 @@
+# Python imports.
+import traceback
+
+# Third-party imports.
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot, Qt
+
+# Local imports.
+from src.application.managers.database_manager import DatabaseManager, ConnectionPool
+
+class QueryJob(QObject):
+    # Emitted on the GUI thread once the job is done, unless it was cancelled.
+    finished = Signal(object)
+    failed = Signal(object)
+    
+    # Emitted on the worker thread, queued over to the GUI thread.
+    _result_ready = Signal(object)
+    _error_raised = Signal(object)
+    
+    def __init__(self, function, args: tuple, kwargs: dict, write: bool = False):
+        """A class object containing a query to run on a worker thread, delivering its result through signals.
+        
+        Args:
+            function (callable): Function to run, it should create any DatabaseManager it needs so the connection belongs to the worker.
+            args (tuple): Arguments to call the function with.
+            kwargs (dict): Keyword arguments to call the function with.
+            write (bool, optional): If the job changes the database, it's always run even once cancelled and only the result is dropped.
+        """
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.write = write
+        
+        self.cancelled = False
+        
+        # Queued so the results are handled on the thread the job was made on, the GUI thread.
+        self._result_ready.connect(self._deliver_result, Qt.ConnectionType.QueuedConnection)
+        self._error_raised.connect(self._deliver_error, Qt.ConnectionType.QueuedConnection)
+    
+    @Slot()
+    def cancel(self):
+        """A function to cancel the job, its result will never be delivered."""
+        self.cancelled = True
+    
+    def run(self):
+        """A function to run the job, called on the worker thread."""
+        if self.cancelled is True and self.write is False:
+            self._result_ready.emit(None) # Dropped on the GUI thread, which still deletes the job.
+            
+            return # Return early, nobody is waiting for the result.
+        
+        try:
+            result = self.function(*self.args, **self.kwargs)
+        
+        except Exception as error:
+            traceback.print_exc()
+            
+            self._error_raised.emit(error)
+            
+            return # Return early, failed.
+        
+        self._result_ready.emit(result)
+    
+    @Slot(object)
+    def _deliver_result(self, result: object):
+        """A function to deliver the result on the GUI thread.
+        
+        Args:
+            result (object): Value returned by the function.
+        """
+        if self.cancelled is False:
+            self.finished.emit(result)
+        
+        self.deleteLater()
+    
+    @Slot(object)
+    def _deliver_error(self, error: Exception):
+        """A function to deliver an error raised by the function on the GUI thread.
+        
+        Args:
+            error (Exception): Error raised by the function.
+        """
+        if self.cancelled is False:
+            self.failed.emit(error)
+        
+        self.deleteLater()
+
+class QueryRunnable(QRunnable):
+    def __init__(self, job: QueryJob):
+        """A subclass of QRunnable, used to run a query job on the thread pool.
+        
+        Args:
+            job (QueryJob): Job to run.
+        """
+        super().__init__()
+        self.job = job
+    
+    def run(self):
+        """A function called by the thread pool on a worker thread."""
+        self.job.run()
+
+class QueryManager:
+    def __init__(self, connection_pool: ConnectionPool, max_threads: int = 2):
+        """A class object running database queries off the GUI thread, so a slow query or lock wait doesn't freeze the window.
+        
+        Each worker thread takes its own connections from the connection pool.
+        
+        Args:
+            connection_pool (ConnectionPool): Pool the worker threads take their connections from.
+            max_threads (int, optional): Most queries run at the same time.
+        """
+        self.connection_pool = connection_pool
+        
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(max_threads)
+        
+        # Idle workers are never retired, the connections they opened are kept by the pool under their thread.
+        self.thread_pool.setExpiryTimeout(-1)
+        
+        self.jobs : set[QueryJob] = set() # Jobs waiting to deliver, kept so they aren't cleaned up.
+    
+    def run(
+            self,
+            function,
+            *args,
+            owner: QObject = None,
+            on_result = None,
+            on_error = None,
+            write: bool = False,
+            **kwargs
+    ) -> QueryJob:
+        """A function to run a function on a worker thread, calling back on the GUI thread with the result.
+        
+        Args:
+            function (callable): Function to run, it should create any DatabaseManager it needs.
+            owner (QObject, optional): Object waiting on the result, the job is cancelled once it's destroyed.
+            on_result (callable, optional): Called with the result on the GUI thread.
+            on_error (callable, optional): Called with any error raised on the GUI thread, defaults to printing it.
+            write (bool, optional): If the job changes the database, so it runs even if cancelled.
+        
+        Returns:
+            QueryJob: Job that was started, which can be cancelled.
+        """
+        job = QueryJob(function, args, kwargs, write)
+        
+        if on_result is not None:
+            job.finished.connect(on_result)
+        
+        job.failed.connect(on_error if on_error is not None else self._print_error)
+        
+        # Drop the result if the widget waiting for it is closed, like when the user navigates away.
+        if owner is not None:
+            owner.destroyed.connect(job.cancel)
+        
+        self.jobs.add(job)
+        job.destroyed.connect(lambda: self.jobs.discard(job))
+        
+        self.thread_pool.start(QueryRunnable(job))
+        
+        return job
+    
+    def query(self, database_src: str, method: str, *args, **kwargs) -> QueryJob:
+        """A function to call a DatabaseManager method on a worker thread.
+        
+        Args:
+            database_src (str): Path to the database.
+            method (str): Name of the DatabaseManager method to call, its arguments follow.
+        
+        Returns:
+            QueryJob: Job that was started, which can be cancelled.
+        """
+        return self.run(_call_database_manager, database_src, method, *args, **kwargs)
+    
+    def shutdown(self):
+        """A function to wait for running queries then close the pooled connections, called as the application quits."""
+        for job in self.jobs:
+            job.cancel()
+        
+        self.thread_pool.waitForDone()
+        
+        # Workers are done with their connections, so they can all be closed from here.
+        self.connection_pool.close_all()
+    
+    def _print_error(self, error: Exception):
+        """A function to print an error raised by a query nobody handled.
+        
+        Args:
+            error (Exception): Error raised by the query.
+        """
+        print(f"Query failed: {error}")
+
+def _call_database_manager(database_src: str, method: str, *args, **kwargs) -> object:
+    """A function to call a DatabaseManager method, run on a worker thread.
+    
+    Args:
+        database_src (str): Path to the database.
+        method (str): Name of the DatabaseManager method to call.
+    
+    Returns:
+        object: Value returned by the method.
+    """
+    database_manager = DatabaseManager(database_src)
+    
+    return getattr(database_manager, method)(*args, **kwargs)
@@ -17,11 +17,16 @@ def path(src: str) -> str:
         str: Real path of the file.
     """
     
+    base_path = getattr(sys, "_MEIPASS", os.path.abspath("."))
+    
+    # Already a real path, resolving it again would nest it under the base path.
+    if src.startswith(base_path + os.sep):
+        return src
+    
     # Remove the first / from the src string if present.
     if src[0] == "/":
         src = src[1:]
         
-    base_path = getattr(sys, "_MEIPASS", os.path.abspath("."))
     path = os.path.join(base_path, src)
     
     # If there's a file found in the path.
@@ -2,6 +2,7 @@
 import sqlite3
 import random
 import math
+from datetime import datetime
 
 # Third-party imports.
 from PySide6.QtWidgets import (
@@ -10,16 +11,18 @@ from PySide6.QtWidgets import (
 )
 
 from PySide6.QtCore import (
-    QPoint, Qt, QSize, QTimer
+    QPoint, Qt, QSize, QTimer, Slot
 )
 
 from PySide6.QtGui import (
-    QPixmap, QIcon, QMouseEvent, QFontMetrics, QColor
+    QPixmap, QIcon, QMouseEvent, QFontMetrics, QColor, QShortcut, QKeySequence
 )
 
 # Local imports.
 from src.shared.objects import *
 from src.shared.funcs import *
-from src.application.managers.database_manager import DatabaseManager
+from src.application.managers.database_manager import DatabaseManager, query_profiler
+from src.application.managers.query_manager import QueryManager, QueryJob
+from src.application.managers.message_watcher import MessageWatcher
 from src.application.managers.font_manager import FontManager
 from src.application.managers.colour_manager import ColourManager
\ No newline at end of file
@@ -0,0 +1,120 @@
+# File containing the versioned schema migrations of the databases.
+import os
+import sqlite3
+
+from src.shared.funcs import path
+
+def get_migrations(database_name: str) -> list[tuple[int, str]]:
+    """A function to get the migration scripts of a database, in the order they should be applied.
+    
+    Migrations are stored in /data/migrations/<database_name> as <version>_<name>.sql.
+    
+    Args:
+        database_name (str): Name of the database, like chat or gym.
+    
+    Returns:
+        list[tuple[int, str]]: Version and path of each migration script.
+    """
+    migrations_dir = path(f"/data/migrations/{database_name}")
+    
+    if not os.path.isdir(migrations_dir):
+        return [] # Return early, no migrations for this database.
+    
+    migrations : list[tuple[int, str]] = []
+    for file in os.listdir(migrations_dir):
+        if not file.endswith(".sql"):
+            continue
+        
+        version = int(file.split("_")[0])
+        migrations.append((version, f"{migrations_dir}/{file}"))
+    
+    return sorted(migrations)
+
+def split_statements(script: str) -> list[str]:
+    """A function to split an sql script into its complete statements.
+    
+    Args:
+        script (str): Contents of the sql script.
+    
+    Returns:
+        list[str]: Each statement within the script.
+    """
+    statements : list[str] = []
+    statement = ""
+    
+    for line in script.splitlines(keepends = True):
+        statement += line
+        
+        # Triggers contain ; inside their body, so let sqlite decide when a statement is complete.
+        if sqlite3.complete_statement(statement):
+            statements.append(statement.strip())
+            statement = ""
+    
+    if statement.strip() != "":
+        statements.append(statement.strip()) # Last statement without a trailing ;
+    
+    return statements
+
+def migrate(database_src: str, database_name: str) -> int:
+    """A function to bring a database up to the latest version, creating it if it doesn't exist.
+    
+    The version is tracked with PRAGMA user_version. A database at version 0 is given the schema from
+    /data/schemas first, then every migration newer than the current version is applied. Everything
+    runs over one connection inside a single transaction, so a failure leaves the database untouched.
+    
+    Args:
+        database_src (str): Path to the database.
+        database_name (str): Name of the database, like chat or gym.
+    
+    Returns:
+        int: Version of the database after migrating.
+    """
+    connection = sqlite3.connect(database_src, isolation_level = None) # Transactions are handled here.
+    
+    current_version = connection.execute("PRAGMA user_version").fetchone()[0]
+    
+    scripts : list[tuple[int, str]] = []
+    
+    if current_version == 0:
+        scripts.append((0, path(f"/data/schemas/{database_name}.sql")))
+    
+    scripts += [migration for migration in get_migrations(database_name) if migration[0] > current_version]
+    
+    if scripts == []:
+        connection.close()
+        
+        print(f"{database_name} is up to date at version {current_version}")
+        
+        return current_version # Return early, nothing to apply.
+    
+    latest_version = scripts[-1][0]
+    
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        
+        for version, script_path in scripts:
+            with open(script_path, "r") as file:
+                script = file.read()
+            
+            for statement in split_statements(script):
+                connection.execute(statement)
+            
+            print(f"Applied {os.path.basename(script_path)} to {database_name}")
+        
+        connection.execute(f"PRAGMA user_version = {latest_version}")
+        connection.execute("COMMIT")
+    
+    except sqlite3.Error:
+        # Undo every script, leaving the database at its previous version.
+        if connection.in_transaction:
+            connection.execute("ROLLBACK")
+        
+        connection.close()
+        
+        raise
+    
+    connection.close()
+    
+    print(f"Migrated {database_name} from version {current_version} to {latest_version}")
+    
+    return latest_version
@@ -1,12 +1,45 @@
 # Python imports
 import json
-import ast
-from datetime import datetime
+import sqlite3
+from datetime import datetime, timezone
+from enum import Enum
 
 # Third-party imports.
 from PySide6.QtWidgets import QApplication
 
+def to_epoch(date: datetime) -> int:
+    """A function to convert a class start time to the integer stored in the database.
+    
+    The wall-clock time is read as UTC, matching sqlite's strftime('%s') on the start_date text.
+    
+    Args:
+        date (datetime): Start time to convert.
+    
+    Returns:
+        int: Seconds since the epoch.
+    """
+    return int(date.replace(tzinfo = timezone.utc).timestamp())
+
+def from_epoch(epoch: int) -> datetime:
+    """A function to convert an integer start time from the database back to a datetime.
+    
+    Args:
+        epoch (int): Seconds since the epoch, as stored by to_epoch.
+    
+    Returns:
+        datetime: Wall-clock start time.
+    """
+    return datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo = None)
+
+class EnrollmentResult(Enum):
+    # Outcomes of enrolling a member into a class.
+    ENROLLED = "enrolled"
+    ALREADY_ENROLLED = "already enrolled"
+    FULL = "full"
+
 class Member:
+    __slots__ = ("id", "forename", "surname", "email", "phone", "password", "is_tutor", "profile")
+    
     def __init__(
             self,
             id: int,
@@ -19,7 +52,7 @@ class Member:
             profile: str
     ):
         """An object containing data related to a member.
-
+        
         Args:
             id (int): ID of the user.
             forename (str): Forename of the user.
@@ -35,32 +68,97 @@ class Member:
         self.password = password
         self.is_tutor = is_tutor
         self.profile = profile
+    
+    @classmethod
+    def from_row(cls, cursor: sqlite3.Cursor, row: tuple) -> "Member":
+        """A function used as a cursor's row_factory, creating a member straight from a row of the members table.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor the row was fetched by.
+            row (tuple): Row of (id, forename, surname, email, phone, password, is_tutor, profile).
+        
+        Returns:
+            Member: Member object of the row.
+        """
+        return cls(*row)
 
 class Message:
-    def __init__(self, member: Member, text: str):
+    __slots__ = ("member", "text", "id", "sent_at")
+    
+    def __init__(self, member: Member, text: str, id: int = None, sent_at: datetime = None):
         """An object containing the data of a message.
-
+        
         Args:
             member (Member): Member that sent the message.
             text (str): Text content of the message.
+            id (int, optional): ID of the message, set once it's stored in the database.
+            sent_at (datetime, optional): Time the message was sent, defaults to now.
         """
         self.member = member
         self.text = text
+        self.id = id
+        self.sent_at = sent_at if sent_at is not None else datetime.now()
 
 class Chat:
-    def __init__(self, chat_data: tuple):
+    __slots__ = ("id", "member_ids", "_members", "_messages")
+    
+    def __init__(self, id: int, member_ids: list[int]):
         """An object containing chat data related to a member.
-
+        
+        The members and messages aren't loaded until they're first used, then kept until the chat is released.
+        
+        Args:
+            id (int): ID of the chat.
+            member_ids (list[int]): IDs of the members in the chat.
+        """
+        self.id = id
+        self.member_ids = member_ids
+        
+        self._members : list[Member] | None = None
+        self._messages : list[Message] | None = None
+    
+    @property
+    def members(self) -> list[Member]:
+        """Members of the chat, loaded on first use."""
+        if self._members is None:
+            self._members = self.get_members()
+        
+        return self._members
+    
+    @property
+    def messages(self) -> list[Message]:
+        """Every message of the chat, loaded on first use."""
+        if self._messages is None:
+            self._messages = self.get_messages()
+        
+        return self._messages
+    
+    def append_message(self, message: Message):
+        """A function to add a sent message to the chat, only kept if the messages have already been loaded.
+        
         Args:
-            chat_data (tuple): Chat data retrieved from the database.
+            message (Message): Message that was sent.
         """
-        self.chat_data = chat_data
+        if self._messages is not None:
+            self._messages.append(message)
+    
+    def release(self):
+        """A function to drop the loaded members and messages, called once the chat is closed."""
+        self._members = None
+        self._messages = None
+    
+    @classmethod
+    def from_row(cls, cursor: sqlite3.Cursor, row: tuple) -> "Chat":
+        """A function used as a cursor's row_factory, creating a chat from a row of the chats table.
         
-        print(self.chat_data)
+        Args:
+            cursor (sqlite3.Cursor): Cursor the row was fetched by.
+            row (tuple): Row of (id, members, messages), members being a json list of IDs.
         
-        self.id = self.chat_data[0]
-        self.members = self.get_members()
-        self.messages = self.get_messages()
+        Returns:
+            Chat: Chat object of the row.
+        """
+        return cls(row[0], json.loads(row[1])) # [113, 114] -> list.
     
     def get_members(self) -> list[Member]:
         """A function to retrieve the member objects inside the chat.
@@ -71,57 +169,94 @@ class Chat:
         # Connection to the gym database to obtain member data.
         database = QApplication.instance().property("DatabaseManager")("data/gym.sqlite")
         
-        members : list[Member] = [] # Member storage.
-        chat_ids = self.chat_data[1].replace("[", "").replace("]", "").split(", ") # [113, 114] -> list.
-        
-        for id in chat_ids:
-            members.append(database.get_member(id = id))
+        # Get every member in one query, keeping the order they're listed in the chat.
+        found_members = database.get_members(self.member_ids)
         
-        return members
+        return [found_members[id] for id in self.member_ids if id in found_members]
     
     def get_messages(self) -> list[Message]:
         """A function to get all messages within a chat.
-
+        
         Returns:
             list[Message]: A list of message objects from the chat.
         """
-        message_dicts = self.chat_data[2].replace("[", "").replace("]", "").split("}, ")
+        # Connection to the chat database to obtain the messages.
+        database = QApplication.instance().property("DatabaseManager")("data/chat.sqlite")
         
-        if message_dicts[0] == "":
-            return [] # Return early.
-        
-        raw_messages : list[dict] = [] # List of dictionary storage.
-        for message in message_dicts:            
-            if message[-1] != "}":
-                message = message + "}"
-            
-            raw_messages.append(json.loads(message))
+        # Look each sender up by ID rather than searching the members for every message.
+        members_by_id : dict[int, Member] = {member.id: member for member in self.members}
         
         messages : list[Message] = [] # Storage for Messages
-        for message in raw_messages:
-            user_id = message["user_id"]
+        for message_id, member_id, sent_at, text in database.get_chat_messages(self.id):
+            member = members_by_id.get(member_id)
             
-            # Get the Member object of the user who sent the message.
-            for member in self.members:
-                if member.id == user_id:
-                    # Create a message object from found member object.
-                    messages.append(Message(member, message["text"]))
+            if member is None:
+                continue # Skip messages from anyone no longer in the chat.
+            
+            messages.append(Message(member, text, message_id, datetime.fromtimestamp(sent_at)))
         
         return messages
 
+class SidebarChat:
+    __slots__ = ("id", "member", "snippet", "last_activity")
+    
+    def __init__(self, id: int, member: Member, snippet: str | None, last_activity: datetime | None):
+        """A lightweight object containing what the chat sidebar shows for a chat, without its history.
+        
+        Args:
+            id (int): ID of the chat.
+            member (Member): The other member in the chat.
+            snippet (str | None): Start of the last message, None if nothing has been sent.
+            last_activity (datetime | None): Time the last message was sent, None if nothing has been sent.
+        """
+        self.id = id
+        self.member = member
+        self.snippet = snippet
+        self.last_activity = last_activity
+
+class SearchResult:
+    __slots__ = ("chat_id", "message", "snippet")
+    
+    def __init__(self, chat_id: int, message: Message, snippet: str):
+        """An object containing a message found by searching the chats.
+        
+        Args:
+            chat_id (int): ID of the chat the message is in.
+            message (Message): Message that was found.
+            snippet (str): Part of the message around the match, with the matched words in square brackets.
+        """
+        self.chat_id = chat_id
+        self.message = message
+        self.snippet = snippet
+
 class AvailableClass:
-    def __init__(self, class_data: dict):
+    __slots__ = ("id", "tutor_id", "title", "description", "start_date")
+    
+    def __init__(self, id: int, tutor_id: int, title: str, description: str, start_date: datetime):
         """A class object containing the data of an available class from the classes database.
-
+        
+        Args:
+            id (int): ID of the class.
+            tutor_id (int): ID of the member tutoring the class.
+            title (str): Title of the class.
+            description (str): Description of the class.
+            start_date (datetime): Time the class starts.
+        """
+        self.id = id
+        self.tutor_id = tutor_id
+        self.title = title
+        self.description = description
+        self.start_date = start_date
+    
+    @classmethod
+    def from_row(cls, cursor: sqlite3.Cursor, row: tuple) -> "AvailableClass":
+        """A function used as a cursor's row_factory, creating a class from a row of (id, tutor_id, title, description, start_at).
+        
         Args:
-            chat_data (tuple): Data retrieved from the classes database.
+            cursor (sqlite3.Cursor): Cursor the row was fetched by.
+            row (tuple): Row fetched from the classes table.
+        
+        Returns:
+            AvailableClass: Class object of the row.
         """
-        self.class_data = class_data
-        self.id : int = self.class_data["id"]
-        self.tutor_id : int = self.class_data["tutor_id"]
-        self.title : str = self.class_data["title"]
-        self.description : str = self.class_data["description"]
-        self.start_date = datetime.strptime(self.class_data["start_date"], "%Y-%m-%d %H:%M")
-        
-        # Retrieve the applied memebrs as a list from a string.
-        self.applied_members : list[int] = ast.literal_eval(self.class_data["applied_members"])
\ No newline at end of file
+        return cls(row[0], row[1], row[2], row[3], from_epoch(row[4]))
\ No newline at end of file
@@ -1,51 +1,58 @@
 # File to run as the program starts up.
-import os
 import sqlite3
 
 from src.shared.funcs import path
+from src.shared.migrations import migrate
+from src.application.managers.database_manager import DatabaseProfile, DatabaseManager, ConnectionPool
 
 def startup() -> bool:
     """A function usedd in startup to check if everything is working as it should be.
-
+    
     Returns:
         bool: True on fail, False of pass.
     """
     required_databases = ["chat.sqlite", "gym.sqlite"]
-    database_list = os.listdir(path("/data"))
     
-    print(f"Searching for required files: {required_databases}")
+    print(f"Migrating required databases: {required_databases}")
     
-    for file in database_list:
-        if file in required_databases:
-            required_databases.remove(file)
-            
-            print(f"Found required file: {file}")
-    
-    # If there's any still left in the required, create the database.
+    # Create any missing databases and bring every database up to date.
     for database in required_databases:
         database_name = database.replace(".sqlite", "")
-        schema_path = path(f"/data/schemas/{database_name}.sql")
         
-        print(f"Generating {database} from /data/schemas/{database_name}.sql")
+        try:
+            migrate(path(f"/data/{database}"), database_name)
         
-        with open(schema_path, "r") as file:
-            sql_query = file.read()
+        except sqlite3.Error as error:
+            print(f"Unable to migrate {database}: {error}")
+            
+            return True # Return early, failed.
+    
+    # Report the settings sqlite is actually using with the selected performance profile.
+    profile = DatabaseProfile.load()
+    
+    for database in required_databases:
+        connection = sqlite3.connect(path(f"/data/{database}"))
+        profile.apply(connection)
         
-        # Get seperate queries from the file.
-        sql_queries = sql_query.split("\n")
+        print(f"{database} using the {profile.name} profile: {profile.get_effective(connection)}")
         
-        # For each query, call the command.
-        for query in sql_queries:
-            # Create the database with a cursor.
-            connection = sqlite3.connect(path(f"/data/{database}"))
-            cursor = connection.cursor()
-            
-            print(query)
-            
-            # Try and execute the query from the schema to the database.
-            cursor.execute(query)
-            connection.commit()
-
-        print(f"Successfully created: {database}")
+        connection.close()
+    
+    # Finish any class application a crash left half committed across the two databases.
+    connection_pool = ConnectionPool(profile)
+    
+    try:
+        recovered = DatabaseManager(path("/data/chat.sqlite"), connection_pool).recover_class_welcomes(path("/data/gym.sqlite"))
+    
+    except sqlite3.Error as error:
+        print(f"Unable to recover class welcomes: {error}")
+        
+        return True # Return early, failed.
+    
+    finally:
+        connection_pool.close_all()
+    
+    if recovered > 0:
+        print(f"Recovered {recovered} unsent class welcomes.")
     
     return False
\ No newline at end of file
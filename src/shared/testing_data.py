@@ -1,199 +1,557 @@
 # A file to load testing data into the database.
 
 import sqlite3
+import argparse
+import multiprocessing
+import string
+import time
 from faker import Faker
 import random
 import os
 from datetime import datetime, timedelta
 
-from src.shared.objects import Member
+from src.shared.objects import to_epoch, from_epoch
 from src.shared.funcs import path
+from src.shared.migrations import migrate
+from src.application.managers.database_manager import DatabaseProfile, get_database_path
+
+classes = [
+    {
+        "Title": "Swimming Class",
+        "Description": "We will be teaching you how to swim!"
+    },
+    {
+        "Title": "Weight Lifting",
+        "Description": "Weight lifting best practises."
+    },
+    {
+        "Title": "Marathon",
+        "Description": "Marathon event, come join!"
+    },
+    {
+        "Title": "Treadmill Class",
+        "Description": "Let's listen to some jams and tread!"
+    },
+    {
+        "Title": "Dietry",
+        "Description": "Best dietry options to gain muscle."
+    }
+]
+
+# State of the stage being generated, set in each worker process by init_worker.
+worker_state : dict = {}
+
+def init_worker(state: dict):
+    """A function to set up a process generating shards, called once as each worker process starts.
+    
+    Args:
+        state (dict): Seed, sizes and anything read from the databases the stage needs.
+    """
+    worker_state.clear()
+    worker_state.update(state)
+    
+    # Every worker builds the same Faker instance and message texts from the seed.
+    faker = Faker("en_GB")
+    faker.seed_instance(state["seed"])
+    
+    worker_state["faker"] = faker
+    worker_state["sentences"] = [faker.sentence() for x in range(500)]
+
+def seed_shard(stage: str, shard_index: int) -> tuple[random.Random, Faker]:
+    """A function to seed the generators for a shard, so it generates the same rows whichever process runs it.
+    
+    Args:
+        stage (str): Name of the stage, like members.
+        shard_index (int): Position of the shard within the stage.
+    
+    Returns:
+        tuple[random.Random, Faker]: Seeded random and Faker generators.
+    """
+    shard_seed = f"{worker_state['seed']}-{stage}-{shard_index}"
+    
+    faker : Faker = worker_state["faker"]
+    faker.seed_instance(shard_seed)
+    
+    return random.Random(shard_seed), faker
+
+def generate_members_shard(shard: tuple[int, int, int]) -> dict[str, list[tuple]]:
+    """A function to generate the member rows of a shard.
+    
+    Args:
+        shard (tuple[int, int, int]): Index of the shard, number of its first member and amount of members.
+    
+    Returns:
+        dict[str, list[tuple]]: Rows of the members table.
+    """
+    shard_index, start, count = shard
+    shard_random, faker = seed_shard("members", shard_index)
+    
+    password_characters = string.ascii_letters + string.digits
+    members : list[tuple] = []
+    
+    for x in range(start, start + count):
+        forename = faker.first_name()
+        surname = faker.last_name()
+        
+        # Numbered so emails stay unique however many members there are.
+        email = f"{forename}.{surname}{x}@example.com".lower().replace(" ", "")
+        phone = faker.phone_number()
+        password = "".join(shard_random.choices(password_characters, k = shard_random.randint(5, 13)))
+        profile = f"{shard_random.randint(1, worker_state['profile_count'])}.png"
+        
+        # 1 in 10 change for someone to be a tutor.
+        is_tutor = 1 if shard_random.randint(1, 10) == 1 else 0
+        
+        members.append((forename, surname, email, phone, password, is_tutor, profile))
+    
+    return {"members": members}
+
+def generate_chats_shard(shard: tuple[int, int, int]) -> dict[str, list[tuple]]:
+    """A function to generate the chats started by the members of a shard, with their messages.
+    
+    Chats are numbered from 0 within the shard, the writer gives them their real IDs.
+    
+    Args:
+        shard (tuple[int, int, int]): Index of the shard, position of its first member and amount of members.
+    
+    Returns:
+        dict[str, list[tuple]]: Members of each chat, and the messages of each chat.
+    """
+    shard_index, start, count = shard
+    shard_random, faker = seed_shard("chats", shard_index)
+    
+    member_ids : list[int] = worker_state["member_ids"]
+    chat_counts : dict[int, int] = worker_state["chat_counts"]
+    sentences : list[str] = worker_state["sentences"]
+    
+    chats : list[tuple] = []
+    messages : list[tuple] = []
+    
+    for member_id in member_ids[start:start + count]:
+        chats_remaining = worker_state["sizes"]["chats_per_member"] - chat_counts.get(member_id, 0)
+        
+        # For each remaining chat.
+        for x in range(chats_remaining):
+            while True:
+                receiver_id = shard_random.choice(member_ids)
+                
+                if receiver_id != member_id: break
+            
+            chat_index = len(chats)
+            chats.append((member_id, receiver_id))
+            
+            # Chats start at some point in the last 90 days, alternating between both members.
+            sent_at = worker_state["now"] - shard_random.randint(0, 90 * 24 * 60 * 60)
+            
+            for message_index in range(worker_state["sizes"]["messages_per_chat"]):
+                sent_at += shard_random.randint(30, 60 * 60)
+                
+                messages.append((
+                    chat_index,
+                    member_id if message_index % 2 == 0 else receiver_id,
+                    sent_at,
+                    shard_random.choice(sentences)
+                ))
+    
+    return {"chats": chats, "messages": messages}
+
+def generate_classes_shard(shard: tuple[int, int, int]) -> dict[str, list[tuple]]:
+    """A function to generate the classes of a shard, with their enrollments.
+    
+    Args:
+        shard (tuple[int, int, int]): Index of the shard, ID of its first class and amount of classes.
+    
+    Returns:
+        dict[str, list[tuple]]: Rows of the classes and enrollments tables.
+    """
+    shard_index, start, count = shard
+    shard_random, faker = seed_shard("classes", shard_index)
+    
+    tutor_ids : list[int] = worker_state["tutor_ids"]
+    student_ids : list[int] = worker_state["student_ids"]
+    now = from_epoch(worker_state["now"])
+    
+    class_rows : list[tuple] = []
+    enrollment_rows : list[tuple] = []
+    
+    for class_id in range(start, start + count):
+        creating_class = shard_random.choice(classes)
+        title = creating_class["Title"]
+        description = creating_class["Description"]
+        start_date = now + timedelta(days = shard_random.randint(7, 60), hours = shard_random.randint(-12, 12))
+        start_date = start_date.replace(minute = 0)
+        start_at = to_epoch(start_date)
+        start_date = datetime.strftime(start_date, "%Y-%m-%d %H:%M")
+        
+        tutor_id = shard_random.choice(tutor_ids)
+        
+        class_rows.append((class_id, tutor_id, "[]", title, description, start_date, start_at))
+        
+        # Enroll the applied members into the class.
+        if student_ids != []:
+            for i in range(shard_random.randint(0, worker_state["sizes"]["enrollments_per_class"])):
+                enrollment_rows.append((class_id, shard_random.choice(student_ids), worker_state["now"]))
+    
+    return {"classes": class_rows, "enrollments": enrollment_rows}
 
 class TestingData:
-    def __init__(self):
-        self.chat_connection = sqlite3.connect(path("data/chat.sqlite"))
-        self.gym_connection = sqlite3.connect(path("data/gym.sqlite"))
+    # Sizes of the generated data, picked by name.
+    presets = {
+        "default": {
+            "members": 100,
+            "chats_per_member": 5,
+            "messages_per_chat": 2,
+            "classes": 10,
+            "enrollments_per_class": 5
+        },
+        "1k": {
+            "members": 1_000,
+            "chats_per_member": 5,
+            "messages_per_chat": 20,
+            "classes": 200,
+            "enrollments_per_class": 15
+        },
+        "100k": {
+            "members": 100_000,
+            "chats_per_member": 3,
+            "messages_per_chat": 10,
+            "classes": 10_000,
+            "enrollments_per_class": 20
+        },
+        "1m": {
+            "members": 1_000_000,
+            "chats_per_member": 1,
+            "messages_per_chat": 5,
+            "classes": 50_000,
+            "enrollments_per_class": 20
+        }
+    }
+    
+    def __init__(
+            self,
+            preset: str = "default",
+            seed: int = 2073,
+            chat_database_src: str = "data/chat.sqlite",
+            gym_database_src: str = "data/gym.sqlite",
+            workers: int = 1,
+            shard_size: int = 5_000,
+            now: datetime = None
+    ):
+        """A class object generating testing data, topping the databases up to the sizes of a preset.
+        
+        Rows are generated in shards, each seeded from the seed and its position, so the same seed always
+        generates the same rows however many workers there are. With more than one worker the shards are
+        generated across a pool of processes and streamed back in order to this process, which writes them
+        with executemany inside a single transaction per database. Dates are relative to now, so the same
+        seed and now always generate the same dates too.
+        
+        Args:
+            preset (str, optional): Name of the size preset, default, 1k, 100k or 1m.
+            seed (int, optional): Seed of the random and Faker generators.
+            chat_database_src (str, optional): Path to the chat database.
+            gym_database_src (str, optional): Path to the gym database.
+            workers (int, optional): Processes generating shards, 1 generates them in this process.
+            shard_size (int, optional): Members or classes generated by each shard.
+            now (datetime, optional): Time the generated dates are relative to, defaults to the current time.
+        """
+        self.preset = preset
+        self.sizes = self.presets[preset]
+        self.seed = seed
+        self.workers = workers
+        self.shard_size = shard_size
+        self.now = (now if now is not None else datetime.now()).replace(second = 0, microsecond = 0)
+        
+        # Transactions are handled here, so each stage is committed once.
+        self.chat_connection = sqlite3.connect(get_database_path(chat_database_src), isolation_level = None)
+        self.gym_connection = sqlite3.connect(get_database_path(gym_database_src), isolation_level = None)
+        
+        # Tune both connections for writing lots of rows.
+        profile = DatabaseProfile.load("bulk_load")
+        profile.apply(self.chat_connection)
+        profile.apply(self.gym_connection)
         
         self.chat_cursor = self.chat_connection.cursor()
         self.gym_cursor = self.gym_connection.cursor()
         
-        # Faker instance.
-        self.faker = Faker("en_GB")
-    
-        self.member_count = 100
-        self.chats_per_member = 10
-        self.classes_to_generate = 10
+        self.stats : dict[str, dict] = {} # Rows, seconds and rows per second of each stage.
+        
+        print(f"Generating the {preset} preset with seed {seed} relative to {self.now.isoformat()} on {workers} worker(s): {self.sizes}")
         
         self.add_members()
         self.add_chats()
         self.add_classes()
+        
+        self.chat_connection.close()
+        self.gym_connection.close()
+    
+    def get_state(self, **state) -> dict:
+        """A function to get the state the workers of a stage are set up with.
+        
+        Returns:
+            dict: Seed, sizes and time shared by every stage, with the given state of the stage.
+        """
+        return {
+            "seed": self.seed,
+            "sizes": self.sizes,
+            "now": to_epoch(self.now),
+            "profile_count": len(os.listdir(path("/assets/profiles"))),
+            **state
+        }
+    
+    def get_shards(self, start: int, count: int) -> list[tuple[int, int, int]]:
+        """A function to split a range of rows into shards.
+        
+        Args:
+            start (int): First row of the range.
+            count (int): Amount of rows in the range.
+        
+        Returns:
+            list[tuple[int, int, int]]: Index, first row and amount of rows of each shard.
+        """
+        return [
+            (shard_index, shard_start, min(self.shard_size, start + count - shard_start))
+            for shard_index, shard_start in enumerate(range(start, start + count, self.shard_size))
+        ]
+    
+    def generate(self, function, state: dict, shards: list[tuple[int, int, int]]):
+        """A function to generate shards in order, across the worker processes if there's more than one.
+        
+        Args:
+            function (callable): Function generating the rows of a shard.
+            state (dict): State the workers are set up with.
+            shards (list[tuple[int, int, int]]): Shards to generate.
+        
+        Yields:
+            dict[str, list[tuple]]: Rows of each shard, in the order of the shards.
+        """
+        if self.workers <= 1:
+            init_worker(state)
+            
+            yield from map(function, shards)
+            
+            return # Return early, generated in this process.
+        
+        # Spawned so the workers don't inherit the open database connections.
+        context = multiprocessing.get_context("spawn")
+        
+        with context.Pool(self.workers, initializer = init_worker, initargs = (state,)) as pool:
+            yield from pool.imap(function, shards)
+    
+    def write_shards(self, cursor: sqlite3.Cursor, stage: str, queries: dict[str, str], shard_rows) -> dict[str, int]:
+        """A function to insert generated shards with executemany within the open transaction, reporting the rows per second.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor to insert with.
+            stage (str): Name of the stage, used in the report.
+            queries (dict[str, str]): Tables written and the insert statement of each.
+            shard_rows (iterable): Rows of each table for each shard, generated as they're needed.
+        
+        Returns:
+            dict[str, int]: Amount of rows inserted into each table.
+        """
+        started_at = time.perf_counter()
+        
+        inserted = {table: 0 for table in queries}
+        
+        for rows in shard_rows:
+            for table, query in queries.items():
+                cursor.executemany(query, rows[table])
+                inserted[table] += len(rows[table])
+        
+        seconds = time.perf_counter() - started_at
+        total = sum(inserted.values())
+        rows_per_second = total / seconds if seconds > 0 else 0.0
+        
+        self.stats[stage] = {"rows": total, "seconds": seconds, "rows_per_second": rows_per_second, "tables": inserted}
+        
+        print(f"Added {total:,} {stage} rows {inserted} in {seconds:.2f}s ({rows_per_second:,.0f} rows/s)")
+        
+        return inserted
     
     def add_members(self):
         # Get current members.
-        self.gym_cursor.execute("SELECT * FROM members")
-        fetch = self.gym_cursor.fetchall()
-        
-        needed_members = self.member_count
+        existing_members = self.gym_cursor.execute("SELECT COUNT(*) FROM members").fetchone()[0]
         
-        if len(fetch) >= 0:
-            needed_members -= len(fetch)
+        needed_members = self.sizes["members"] - existing_members
         
         if needed_members <= 0:
             return
         
-        print(f"Adding {needed_members} random members to the database.")
+        print(f"Adding {needed_members:,} random members to the database.")
         
-        for x in range(needed_members):
-            forename = self.faker.first_name()
-            surname = self.faker.last_name()
-            email = self.faker.email(safe = True)
-            phone = self.faker.phone_number()
-            password = self.faker.password(random.randint(5, 13))
-            profile = f"{random.randint(1, len(os.listdir(path('/assets/profiles'))))}.png"
-            
-            # 1 in 10 change for someone to be a tutor.
-            is_tutor = 1 if random.randint(1, 10) == 1 else 0
-            
-            # Add to database.
-            self.gym_cursor.execute(
-                "INSERT INTO members"
+        self.gym_cursor.execute("BEGIN")
+        
+        self.write_shards(
+            self.gym_cursor,
+            "members",
+            {
+                "members": "INSERT INTO members"
                 "(forename, surname, email, phone, password, is_tutor, profile)"
-                "VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (forename, surname, email, phone, password, is_tutor, profile)
-            )
-            self.gym_connection.commit() # Commit change.
-
+                "VALUES (?, ?, ?, ?, ?, ?, ?)"
+            },
+            self.generate(generate_members_shard, self.get_state(), self.get_shards(existing_members, needed_members))
+        )
+        
+        self.gym_cursor.execute("COMMIT")
+    
     def add_chats(self):
         # Get a list of current members.
-        self.gym_cursor.execute("SELECT * FROM members")
-        
-        members : list[Member] = []
-        for member in self.gym_cursor.fetchall():
-            members.append(Member(
-                member[0],
-                member[1],
-                member[2],
-                member[3],
-                member[4],
-                member[5],
-                True if member[6] == 1 else False,
-                f"{random.randint(1, 16)}.png"
-            ))
-        
-        for member in members:
-            # Get a list of chats the member is a part of.
+        member_ids = [fetch[0] for fetch in self.gym_cursor.execute("SELECT id FROM members ORDER BY id")]
+        
+        if len(member_ids) < 2:
+            return # Return early, nobody to chat with.
+        
+        # Count the chats of every member at once from the membership index.
+        chat_counts : dict[int, int] = dict(
+            self.chat_cursor.execute("SELECT member_id, COUNT(*) FROM chat_members GROUP BY member_id").fetchall()
+        )
+        
+        if all(chat_counts.get(member_id, 0) >= self.sizes["chats_per_member"] for member_id in member_ids):
+            return # Return early, every member has enough chats.
+        
+        print(f"Adding random chats to {len(member_ids):,} members.")
+        
+        self.chat_cursor.execute("BEGIN")
+        
+        # Indexing each message for search as it's inserted is slow, so the trigger is put back and the new messages indexed at once after.
+        search_trigger = self.chat_cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'messages_search_insert'"
+        ).fetchone()
+        first_message_id = self.chat_cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM messages").fetchone()[0]
+        
+        if search_trigger is not None:
+            self.chat_cursor.execute("DROP TRIGGER messages_search_insert")
+        
+        shards = self.generate(
+            generate_chats_shard,
+            self.get_state(member_ids = member_ids, chat_counts = chat_counts),
+            self.get_shards(0, len(member_ids))
+        )
+        
+        self.write_shards(
+            self.chat_cursor,
+            "chats",
+            {
+                "chats": "INSERT INTO chats (id, members, messages, low_member_id, high_member_id) VALUES (?, ?, ?, ?, ?)",
+                "chat_members": "INSERT INTO chat_members (chat_id, member_id) VALUES (?, ?)",
+                "messages": "INSERT INTO messages (chat_id, member_id, sent_at, text) VALUES (?, ?, ?, ?)"
+            },
+            self.number_chats(shards)
+        )
+        
+        if search_trigger is not None:
+            started_at = time.perf_counter()
+            
             self.chat_cursor.execute(
-                f"SELECT * FROM chats WHERE members "
-                f"LIKE '%[{member.id},%'"
-                f"OR members LIKE '% {member.id},%'"
-                f"OR members LIKE '% {member.id}]%'"
-            ) # Search for all instances of the users ID.
+                "INSERT INTO messages_search (rowid, text) SELECT id, text FROM messages WHERE id >= ?",
+                (first_message_id,)
+            )
+            self.chat_cursor.execute(search_trigger[0])
             
-            member_chats = self.chat_cursor.fetchall()
-            chats_remaining = self.chats_per_member
+            print(f"Indexed the new messages for search in {time.perf_counter() - started_at:.2f}s")
+        
+        self.chat_cursor.execute("COMMIT")
+    
+    def number_chats(self, shards):
+        """A function to give the chats of each shard their IDs as they're written.
+        
+        Args:
+            shards (iterable): Chats and messages of each shard, in order.
+        
+        Yields:
+            dict[str, list[tuple]]: Rows of the chats, chat_members and messages tables of each shard.
+        """
+        next_chat_id = self.chat_cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM chats").fetchone()[0]
+        
+        # Members only have one personal chat with each other, so pairs that were already picked are skipped.
+        pairs : set[tuple[int, int]] = set(self.chat_cursor.execute(
+            "SELECT low_member_id, high_member_id FROM chats WHERE low_member_id IS NOT NULL"
+        ).fetchall())
+        
+        for shard in shards:
+            chats : list[tuple] = []
+            chat_members : list[tuple] = []
+            chat_ids : dict[int, int] = {} # Index of each kept chat in the shard, and its ID.
             
-            if len(member_chats) < chats_remaining:
-                chats_remaining -= len(member_chats)
+            for chat_index, (member_id, receiver_id) in enumerate(shard["chats"]):
+                pair = (min(member_id, receiver_id), max(member_id, receiver_id))
                 
-            else:
-                chats_remaining = 0
-            
-            if float(chats_remaining) <= 0:
-                return
-            
-            print(f"Adding {chats_remaining} random chats to {member.email}")
-            
-            # For each remaining chat.
-            for x in range(chats_remaining):
-                while True:
-                    receiver = random.choice(members)
-                    
-                    if receiver != member: break
+                if pair in pairs:
+                    continue # Already chatting.
                 
-                db_members = f"[{member.id}, {receiver.id}]"
-                db_messages = [
-                    {
-                        "user_id": member.id,
-                        "text": "Heyyyyyy"
-                    },
-                    {
-                        "user_id": receiver.id,
-                        "text": "How are you doing?? :)"
-                    }
-                ]
+                pairs.add(pair)
                 
-                self.chat_cursor.execute(
-                    f"INSERT INTO chats (members, messages) VALUES (?, ?)",
-                    (db_members, str(db_messages).replace("'", "\""))
-                )
-                self.chat_connection.commit()
-                    
+                chat_id = next_chat_id
+                chat_ids[chat_index] = chat_id
+                next_chat_id += 1
+                
+                chats.append((chat_id, f"[{member_id}, {receiver_id}]", "[]", pair[0], pair[1]))
+                chat_members.append((chat_id, member_id))
+                chat_members.append((chat_id, receiver_id))
+            
+            messages = [
+                (chat_ids[chat_index], member_id, sent_at, text)
+                for chat_index, member_id, sent_at, text in shard["messages"]
+                if chat_index in chat_ids
+            ]
+            
+            yield {"chats": chats, "chat_members": chat_members, "messages": messages}
+    
     def add_classes(self):
         # Get the current tutors.
-        self.gym_cursor.execute("SELECT * FROM members WHERE is_tutor = 1")
-        tutor_fetch = self.gym_cursor.fetchall()
+        tutor_ids = [fetch[0] for fetch in self.gym_cursor.execute("SELECT id FROM members WHERE is_tutor = 1 ORDER BY id")]
         
         # Get all members that aren't tutors.
-        self.gym_cursor.execute("SELECT * FROM members WHERE is_tutor = 0")
-        member_fetch = self.gym_cursor.fetchall()        
+        student_ids = [fetch[0] for fetch in self.gym_cursor.execute("SELECT id FROM members WHERE is_tutor = 0 ORDER BY id")]
         
         # Get all available classes.
-        self.gym_cursor.execute("SELECT * FROM classes")
-        classes_fetch = self.gym_cursor.fetchall()
+        existing_classes = self.gym_cursor.execute("SELECT COUNT(*) FROM classes").fetchone()[0]
         
-        remaining_classes = self.classes_to_generate
-        remaining_classes -= len(classes_fetch)
+        remaining_classes = self.sizes["classes"] - existing_classes
         
-        if remaining_classes <= 0:
+        if remaining_classes <= 0 or tutor_ids == []:
             return # Return early.
         
-        print(f"Adding {remaining_classes} classes.")
+        print(f"Adding {remaining_classes:,} classes.")
         
-        classes = [
-            {
-                "Title": "Swimming Class",
-                "Description": "We will be teaching you how to swim!"
-            },
-            {
-                "Title": "Weight Lifting",
-                "Description": "Weight lifting best practises."
-            },
-            {
-                "Title": "Marathon",
-                "Description": "Marathon event, come join!"
-            },
+        next_class_id = self.gym_cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM classes").fetchone()[0]
+        
+        self.gym_cursor.execute("BEGIN")
+        
+        self.write_shards(
+            self.gym_cursor,
+            "classes",
             {
-                "Title": "Treadmill Class",
-                "Description": "Let's listen to some jams and tread!"
+                "classes": "INSERT INTO classes"
+                "(id, tutor_id, applied_members, title, description, start_date, start_at) VALUES"
+                "(?, ?, ?, ?, ?, ?, ?)",
+                "enrollments": "INSERT OR IGNORE INTO enrollments (class_id, member_id, enrolled_at) VALUES (?, ?, ?)"
             },
-            {
-                "Title": "Dietry",
-                "Description": "Best dietry options to gain muscle."
-            }
-        ]
-        
-        for x in range(remaining_classes):
-            creating_class = random.choice(classes)
-            title = creating_class["Title"]
-            description = creating_class["Description"]
-            start_date = datetime.now() + timedelta(days = random.randint(7, 24))
-            start_date = datetime.strftime(start_date, "%Y-%m-%d %H:%M")
-            
-            tutor = random.choice(tutor_fetch)
-            tutor_id = tutor[0]
-            
-            applied_members : list[int] = []
-            
-            for i in range(random.randint(0, 5)):
-                mem = random.choice(member_fetch)
-                applied_members.append(mem[0])
-            
-            # Add the class to the classes table.
-            self.gym_cursor.execute(
-                "INSERT INTO classes"
-                "(tutor_id, applied_members, title, description, start_date) VALUES"
-                "(?, ?, ?, ?, ?)",
-                (tutor_id, str(applied_members), title, description, str(start_date))
+            self.generate(
+                generate_classes_shard,
+                self.get_state(tutor_ids = tutor_ids, student_ids = student_ids),
+                self.get_shards(next_class_id, remaining_classes)
             )
-            
-            self.gym_connection.commit()
\ No newline at end of file
+        )
+        
+        self.gym_cursor.execute("COMMIT")
+
+if __name__ == "__main__":
+    # Generate a dataset from the command line, like: python -m src.shared.testing_data --preset 100k --workers 4
+    parser = argparse.ArgumentParser(description = "Generate testing data for the gym application.")
+    parser.add_argument("--preset", choices = TestingData.presets.keys(), default = "default")
+    parser.add_argument("--seed", type = int, default = 2073)
+    parser.add_argument("--workers", type = int, default = 1, help = "Processes generating rows.")
+    parser.add_argument("--chat", default = "data/chat.sqlite", help = "Path to the chat database.")
+    parser.add_argument("--gym", default = "data/gym.sqlite", help = "Path to the gym database.")
+    parser.add_argument(
+        "--now", type = datetime.fromisoformat, default = None,
+        help = "Time the generated dates are relative to, like 2024-01-01T09:00, defaults to the current time. Give the same value to generate the same dates again."
+    )
+    arguments = parser.parse_args()
+    
+    # Make sure both databases exist and are up to date first.
+    migrate(get_database_path(arguments.chat), "chat")
+    migrate(get_database_path(arguments.gym), "gym")
+    
+    TestingData(arguments.preset, arguments.seed, arguments.chat, arguments.gym, arguments.workers, now = arguments.now)
@@ -43,19 +43,29 @@ class ChatWindow(QWidget):
         self.top_bar = TopBarWidget(self) # Top bar.
         self.chats = Chats(self)
     
-    def open_chat(self, chat: Chat):
-        """A function to open a chat in the current window."""
+    def open_chat(self, chat: Chat, focus_message_id: int = None):
+        """A function to open a chat in the current window.
+        
+        Args:
+            chat (Chat): Chat to open.
+            focus_message_id (int, optional): ID of a message to jump to, defaults to the newest message.
+        """
         if self.current_open_chat is not None:
             self.current_open_chat.deleteLater() # If there's a chat open, delete it.
         
         # Create an open chat widget.
-        self.current_open_chat = OpenChat(self, chat)
+        self.current_open_chat = OpenChat(self, chat, focus_message_id)
 
     def open_create_chat(self):
         """A function to open the create a chat window."""
         # Create a create chat widget.
         self.current_open_chat = CreateChat(self)
     
+    def open_search_chat(self):
+        """A function to open the search chats window."""
+        # Create a search chat widget.
+        self.current_open_chat = SearchChat(self)
+    
     def refresh_chats(self):
         """A function to refresh all chats in the side bar."""
         self.chats.deleteLater() # Delete the chats window.
@@ -71,10 +81,16 @@ class Chats(QWidget):
         super().__init__(parent)
         self.colour_manager : ColourManager = QApplication.instance().property("ColourManager")
         
+        self.chat_buttons : dict[int, ChatButton] = {} # Chat buttons by chat ID.
+        
         self._set_design()
         self._set_layout()
         self.load_chats()
         
+        # Update the button of a chat as soon as it has new messages.
+        message_watcher : MessageWatcher = QApplication.instance().property("MessageWatcher")
+        message_watcher.new_messages.connect(self._on_new_messages)
+        
         # Show the window.
         self.show()
     
@@ -115,35 +131,104 @@ class Chats(QWidget):
     def load_chats(self):
         """A function to load all the chats the member is a part of."""
         logged_member : Member = QApplication.instance().property("LoggedMember")
-        database : DatabaseManager = QApplication.instance().property("DatabaseManager")("data/chat.sqlite")
-    
-        chats_data = database.get_member_chats(logged_member)
+        query_manager : QueryManager = QApplication.instance().property("QueryManager")
         
-        chats : list[Chat] = [] # Chats storage.
-        for chat_data in chats_data:
-            chats.append(Chat(chat_data))
+        # Add the create chat and search buttons to the bottom, the chats are put above them once loaded.
+        self.add_widget(CreateChatButton(self))
+        self.add_widget(SearchChatButton(self))
         
-        # Create a chat icon for each chat the member is a part of.
-        for chat in chats:
-            for chat_member in chat.members:
-                if chat_member != logged_member:
-                    receiver_member = chat_member
-            
-            receiver_profile = circular_pixmap(QPixmap(path(f"/assets/profiles/{receiver_member.profile}")))
-            
-            button = ChatButton(self, chat, receiver_profile)
+        # Resize the contents widget after adding widgets.
+        self.content_widget.setFixedHeight(self.content_widget.sizeHint().height())
+    
+        # Load the feed off the GUI thread, dropped if the sidebar is refreshed first.
+        query_manager.query(
+            "data/chat.sqlite", "get_sidebar_feed", logged_member,
+            owner = self,
+            on_result = self.add_chat_buttons
+        )
+    
+    def add_chat_buttons(self, sidebar_chats: list[SidebarChat]):
+        """A function to add a chat button for each chat in the sidebar feed.
+        
+        Args:
+            sidebar_chats (list[SidebarChat]): Chats the member is a part of, most recent first.
+        """
+        # Create a chat icon for each chat the member is a part of, most recent first.
+        for sidebar_chat in sidebar_chats:
+            if sidebar_chat.id in self.chat_buttons:
+                continue # Already added as it had new messages while the feed loaded.
             
-            self.add_widget(button)
+            self.add_chat_button(sidebar_chat, len(self.chat_buttons))
         
-        # Add the create chat button to the bottom.
-        self.add_widget(CreateChatButton(self))
+        # Resize the contents widget after adding widgets.
+        self.content_widget.setFixedHeight(self.content_widget.sizeHint().height())
+    
+    def add_chat_button(self, sidebar_chat: SidebarChat, index: int):
+        """A function to add the button of a chat to the sidebar.
+        
+        Args:
+            sidebar_chat (SidebarChat): Sidebar data of the chat.
+            index (int): Position to insert the button at.
+        """
+        receiver_profile = circular_pixmap(QPixmap(path(f"/assets/profiles/{sidebar_chat.member.profile}")))
+        
+        button = ChatButton(self, sidebar_chat, receiver_profile)
+        self.chat_buttons[sidebar_chat.id] = button
+        
+        self.add_widget(button, index)
+    
+    @Slot(int, int)
+    def _on_new_messages(self, chat_id: int, since_id: int):
+        """A function called when a chat has new messages, reloading only that chat's button.
+        
+        Args:
+            chat_id (int): ID of the chat with new messages.
+            since_id (int): Newest message ID before the new messages.
+        """
+        logged_member : Member = QApplication.instance().property("LoggedMember")
+        query_manager : QueryManager = QApplication.instance().property("QueryManager")
+        
+        if logged_member is None:
+            return # Return early, nobody is logged in.
+        
+        query_manager.query(
+            "data/chat.sqlite", "get_sidebar_chat", logged_member, chat_id,
+            owner = self,
+            on_result = self.update_chat_button
+        )
+    
+    def update_chat_button(self, sidebar_chat: SidebarChat | None):
+        """A function to move the button of a chat with new messages to the top, adding it if the chat is new.
+        
+        Args:
+            sidebar_chat (SidebarChat | None): Sidebar data of the chat, None if the member isn't in the chat.
+        """
+        if sidebar_chat is None:
+            return # Return early, not one of the member's chats.
+        
+        button = self.chat_buttons.get(sidebar_chat.id)
+        
+        if button is None:
+            self.add_chat_button(sidebar_chat, 0)
+        
+        else:
+            button.set_sidebar_chat(sidebar_chat)
+            
+            # Most recently active first.
+            self.content_layout.removeWidget(button)
+            self.add_widget(button, 0)
         
         # Resize the contents widget after adding widgets.
         self.content_widget.setFixedHeight(self.content_widget.sizeHint().height())
     
-    def add_widget(self, widget: QWidget):
-        """A function to add a widget to the scroll area."""
-        self.content_layout.addWidget(widget, alignment = Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop)
+    def add_widget(self, widget: QWidget, index: int = -1):
+        """A function to add a widget to the scroll area.
+        
+        Args:
+            widget (QWidget): Widget to add.
+            index (int, optional): Position to insert the widget at, defaults to the end.
+        """
+        self.content_layout.insertWidget(index, widget, alignment = Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop)
 
 class CreateChatButton(QPushButton):
     def __init__(self, parent: QWidget):
@@ -179,17 +264,52 @@ class CreateChatButton(QPushButton):
         # Open the create a chat window.
         window.open_create_chat()
   
+class SearchChatButton(QPushButton):
+    def __init__(self, parent: QWidget):
+        """A subclass of QPushButton, used to search the messages of every chat in the side bar.
+
+        Args:
+            parent (QWidget): Parent of the search chat button.
+        """
+        super().__init__(parent)
+        self._set_design()
+
+        # Add a clicked connection.
+        self.clicked.connect(self._on_click)
+    
+    def _set_design(self):
+        """A function to set design elements to the search chat button."""
+        size = min(self.parentWidget().width(), self.parentWidget().height())
+        self.setFixedSize(size, size)
+        
+        self.setIcon(QPixmap(path("/assets/icons/chat.png")))
+        self.setIconSize(QSize(self.size().height() - 5, self.size().width() - 5))
+        
+        self.setStyleSheet("background-color: transparent; border: none;")
+        self.setToolTip("Search chats")
+    
+    def _on_click(self):
+        """A function called when the search chats button is clicked."""
+        window = self.parentWidget().parentWidget().parentWidget().parentWidget().parentWidget()
+        
+        if window.current_open_chat is not None:
+            window.current_open_chat.deleteLater() # Delete the open chat.
+            window.current_open_chat = None # Set it back to none.
+        
+        # Open the search chats window.
+        window.open_search_chat()
+
 class ChatButton(QPushButton):
-    def __init__(self, parent: QWidget, chat: Chat, icon_src: QPixmap):
+    def __init__(self, parent: QWidget, sidebar_chat: SidebarChat, icon_src: QPixmap):
         """A class which is a subclass of QPushButton, used to display a button for each chat.
 
         Args:
             parent (QWidget): Parent of the chat button, typically the chats widget.
-            chat (Chat): Chat object the button belongs to.
+            sidebar_chat (SidebarChat): Sidebar data of the chat the button belongs to.
             icon_src (QPixmap): Icon of the button, usually a profile picture.
         """
         super().__init__(parent)
-        self.chat = chat
+        self.sidebar_chat = sidebar_chat
         self.icon_src = icon_src
         
         self._set_design()
@@ -204,6 +324,27 @@ class ChatButton(QPushButton):
         self.setIconSize(QSize(self.size().height() - 5, self.size().width()- 5))
         
         self.setStyleSheet("background-color: transparent; border: none;")
+        
+        self._set_tooltip()
+    
+    def _set_tooltip(self):
+        """A function to show who the chat is with and the last message when hovered."""
+        member = self.sidebar_chat.member
+        tooltip = f"{member.forename.capitalize()} {member.surname.capitalize()}"
+        
+        if self.sidebar_chat.snippet is not None:
+            tooltip += f"\n{self.sidebar_chat.snippet}"
+        
+        self.setToolTip(tooltip)
+    
+    def set_sidebar_chat(self, sidebar_chat: SidebarChat):
+        """A function to update the button once the chat has changed.
+        
+        Args:
+            sidebar_chat (SidebarChat): Updated sidebar data of the chat.
+        """
+        self.sidebar_chat = sidebar_chat
+        self._set_tooltip()
     
     def _set_connections(self):
         """A function to add connections to the button."""
@@ -211,18 +352,32 @@ class ChatButton(QPushButton):
     
     def _on_click(self):
         """A function called when the chat button is clicked."""
-        self.parentWidget().parentWidget().parentWidget().parentWidget().parentWidget().open_chat(self.chat)
+        # Only load the full chat once it's being opened.
+        database : DatabaseManager = QApplication.instance().property("DatabaseManager")("data/chat.sqlite")
+        chat = database.get_chat(self.sidebar_chat.id)
+        
+        self.parentWidget().parentWidget().parentWidget().parentWidget().parentWidget().open_chat(chat)
         
 class OpenChat(QWidget):
-    def __init__(self, parent: QWidget, chat: Chat) -> None:
+    def __init__(self, parent: QWidget, chat: Chat, focus_message_id: int = None) -> None:
         """An OpenChat QWidget subclass to display an open chat.
 
         Args:
             parent (QWidget): Parent of the OpenChat, typically the Chats widget.
             chat (Chat): Chat to open.
+            focus_message_id (int, optional): ID of a message to jump to, defaults to the newest message.
         """
         super().__init__(parent)
         self.chat = chat
+        self.focus_message_id = focus_message_id
+        self.loading_older_messages = False # If a page of older messages is being added.
+        
+        # Drop anything the chat loaded once it's closed.
+        self.destroyed.connect(self.chat.release)
+        
+        # Add messages sent from anywhere else as they arrive.
+        message_watcher : MessageWatcher = QApplication.instance().property("MessageWatcher")
+        message_watcher.new_messages.connect(self._on_new_messages)
         
         self._set_design()
         self._set_widgets()
@@ -242,7 +397,7 @@ class OpenChat(QWidget):
     
     def _set_widgets(self):
         """A function to add widgets to the openchat widget."""
-        self.message_contents = self.MessageContents(self, self.chat)
+        self.message_contents = self.MessageContents(self, self.chat, self.focus_message_id)
         self.message_box = self.MessageBox(self)
     
     def _set_layout(self):
@@ -263,15 +418,131 @@ class OpenChat(QWidget):
         self.main_layout.addWidget(self.message_box)
             
         self.setLayout(self.main_layout)
+        
+        # Load older messages once the user scrolls to the top.
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self._on_scroll)
+        
+        if self.focus_message_id is None:
+            # Start at the newest message.
+            QTimer.singleShot(10, self.scroll_to_bottom)
+        
+        else:
+            # Start at the message being jumped to.
+            QTimer.singleShot(10, self.scroll_to_focus)
     
     def scroll_to_bottom(self):
         """A function to scroll down to the absolute bottom of the scroll area."""
         self.scroll_area.verticalScrollBar().setValue(self.scroll_area.verticalScrollBar().maximum() + 100) # Scroll to bottom.
     
+    def scroll_to_focus(self):
+        """A function to scroll to the message being jumped to and highlight it."""
+        message_widget = self.message_contents.message_widgets.get(self.focus_message_id)
+        
+        if message_widget is None:
+            return # Return early, the message isn't in this chat.
+        
+        message_widget.setStyleSheet(f"background-color: {message_widget.colour_manager.header};")
+        self.scroll_area.ensureWidgetVisible(message_widget)
+    
+    def _on_scroll(self, value: int):
+        """A function called when the scroll area is scrolled, loading the next page of messages at either end.
+
+        Args:
+            value (int): New value of the scroll bar.
+        """
+        if value == self.scroll_area.verticalScrollBar().maximum() and self.message_contents.has_newer_messages is True:
+            # Newer messages are added below, so nothing moves.
+            if self.message_contents.load_newer_messages() != 0:
+                self.message_contents.update_size()
+            
+            return # Return early, at the bottom.
+        
+        if value != 0 or self.loading_older_messages is True:
+            return # Return early, not at the top or a page is already being added.
+        
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        old_maximum = scroll_bar.maximum()
+        
+        if self.message_contents.load_older_messages() == 0:
+            return # Return early, nothing older.
+        
+        self.loading_older_messages = True
+        self.message_contents.update_size()
+        
+        # Keep the message the user was looking at in the same place.
+        QTimer.singleShot(10, lambda: self._restore_scroll(old_maximum))
+    
+    @Slot(int, int)
+    def _on_new_messages(self, chat_id: int, since_id: int):
+        """A function called when a chat has new messages, loading the ones after the newest message shown.
+        
+        Args:
+            chat_id (int): ID of the chat with new messages.
+            since_id (int): Newest message ID before the new messages.
+        """
+        if chat_id != self.chat.id:
+            return # Return early, another chat.
+        
+        if self.message_contents.has_newer_messages is True:
+            return # Return early, the newer pages are loaded by scrolling down.
+        
+        after_id = self.message_contents.newest_message_id
+        
+        if after_id is None:
+            after_id = since_id # Nothing shown yet.
+        
+        query_manager : QueryManager = QApplication.instance().property("QueryManager")
+        query_manager.query(
+            "data/chat.sqlite", "get_messages", self.chat.id,
+            after_id = after_id,
+            limit = self.message_contents.page_size,
+            owner = self,
+            on_result = self._on_messages_received
+        )
+    
+    def _on_messages_received(self, messages: list[Message]):
+        """A function to add new messages to the bottom of the chat.
+        
+        Args:
+            messages (list[Message]): Messages after the newest message shown, oldest first.
+        """
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+        
+        if self.message_contents.add_new_messages(messages) == 0:
+            return # Return early, every message is already shown.
+        
+        QTimer.singleShot(10, self.message_contents.update_size)
+        
+        # Follow the conversation, unless the user has scrolled up to read.
+        if at_bottom:
+            QTimer.singleShot(10, self.scroll_to_bottom)
+    
+    def _restore_scroll(self, old_maximum: int):
+        """A function to move the scroll area back to the message shown before a page was added above it.
+
+        Args:
+            old_maximum (int): Maximum of the scroll bar before the page was added.
+        """
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum() - old_maximum)
+        
+        self.loading_older_messages = False
+    
     class MessageContents(QWidget):
-        def __init__(self, parent: QWidget, chat: Chat):
+        def __init__(self, parent: QWidget, chat: Chat, focus_message_id: int = None):
             super().__init__(parent)
             self.chat = chat
+            self.focus_message_id = focus_message_id
+            
+            self.page_size = 50 # Messages loaded at a time.
+            self.oldest_message_id : int = None # ID of the oldest message shown.
+            self.newest_message_id : int = None # ID of the newest message shown.
+            self.has_older_messages = True
+            self.has_newer_messages = False
+            
+            self.message_widgets : dict[int, QWidget] = {} # Message widgets by message ID.
+            self.pending_widgets : list[QWidget] = [] # Widgets of sent messages still being added to the database.
             
             self._set_layout()
             self._set_design()
@@ -280,12 +551,126 @@ class OpenChat(QWidget):
             """A function to add layout elements to the message contents."""
             self.main_layout = QVBoxLayout(self)
             
-            # For every message in the chat, add the message widget.
-            for message in self.chat.messages:
-                self.main_layout.addWidget(self.MessageWidget(self, message))
+            if self.focus_message_id is None:
+                # Only the newest page is loaded, older pages are loaded as the user scrolls up.
+                self.load_older_messages()
+            
+            else:
+                # Load the page ending at the message being jumped to, then the page after it.
+                self.oldest_message_id = self.focus_message_id + 1
+                self.load_older_messages()
+                
+                self.newest_message_id = self.focus_message_id
+                self.has_newer_messages = True
+                self.load_newer_messages()
             
             self.setLayout(self.main_layout)
         
+        def add_message_widget(self, message: Message, index: int = -1):
+            """A function to add a message widget to the contents.
+
+            Args:
+                message (Message): Message to display.
+                index (int, optional): Position in the layout to add it at, defaults to the bottom.
+            
+            Returns:
+                MessageWidget: Widget displaying the message.
+            """
+            message_widget = self.MessageWidget(self, message)
+            
+            if message.id is not None:
+                self.message_widgets[message.id] = message_widget
+            
+            self.main_layout.insertWidget(index, message_widget)
+            
+            return message_widget
+        
+        def load_older_messages(self) -> int:
+            """A function to add the page of messages before the oldest message shown to the top of the contents.
+
+            Returns:
+                int: Amount of messages added.
+            """
+            if self.has_older_messages is False:
+                return 0 # Return early, everything is loaded.
+            
+            database : DatabaseManager = QApplication.instance().property("DatabaseManager")("data/chat.sqlite")
+            messages = database.get_messages(self.chat.id, before_id = self.oldest_message_id, limit = self.page_size)
+            
+            # A short page means the start of the chat has been reached.
+            if len(messages) < self.page_size:
+                self.has_older_messages = False
+            
+            if messages == []:
+                return 0 # Return early, nothing to add.
+            
+            self.oldest_message_id = messages[0].id
+            
+            if self.newest_message_id is None:
+                self.newest_message_id = messages[-1].id
+            
+            # Add the message widgets above the ones already shown.
+            for index, message in enumerate(messages):
+                self.add_message_widget(message, index)
+            
+            return len(messages)
+        
+        def load_newer_messages(self) -> int:
+            """A function to add the page of messages after the newest message shown to the bottom of the contents.
+
+            Returns:
+                int: Amount of messages added.
+            """
+            if self.has_newer_messages is False:
+                return 0 # Return early, everything is loaded.
+            
+            database : DatabaseManager = QApplication.instance().property("DatabaseManager")("data/chat.sqlite")
+            messages = database.get_messages(self.chat.id, after_id = self.newest_message_id, limit = self.page_size)
+            
+            # A short page means the end of the chat has been reached.
+            if len(messages) < self.page_size:
+                self.has_newer_messages = False
+            
+            if messages == []:
+                return 0 # Return early, nothing to add.
+            
+            self.newest_message_id = messages[-1].id
+            
+            # Add the message widgets below the ones already shown.
+            for message in messages:
+                self.add_message_widget(message)
+            
+            return len(messages)
+        
+        def add_new_messages(self, messages: list[Message]) -> int:
+            """A function to add messages that arrived after the newest message shown, skipping any already shown.
+            
+            Args:
+                messages (list[Message]): Messages after the newest message shown, oldest first.
+            
+            Returns:
+                int: Amount of messages added.
+            """
+            # A full page means there could be more, loaded by scrolling down.
+            if len(messages) == self.page_size:
+                self.has_newer_messages = True
+            
+            # Sent messages are shown before they have an ID, it's set on the message once added.
+            pending_ids = {widget.message.id for widget in self.pending_widgets}
+            
+            added = 0
+            for message in messages:
+                if self.newest_message_id is None or message.id > self.newest_message_id:
+                    self.newest_message_id = message.id
+                
+                if message.id in self.message_widgets or message.id in pending_ids:
+                    continue # Already shown.
+                
+                self.add_message_widget(message)
+                added += 1
+            
+            return added
+        
         def _set_design(self):
             """A function to set the design of the message contents."""
             if self.sizeHint().height() < self.parentWidget().height():
@@ -433,27 +818,58 @@ class OpenChat(QWidget):
             
             parent = self.parentWidget()
             message_contents = parent.message_contents
-            main_layout = message_contents.main_layout
             
             message = Message(
                 member = QApplication.instance().property("LoggedMember"),
                 text = self.text_edit.toPlainText()
             )
             
-            message_widget = message_contents.MessageWidget(message_contents, message)
+            query_manager : QueryManager = QApplication.instance().property("QueryManager")
+            
+            # Clear text_edit.
+            self.text_edit.clear()
+            
+            # If newer messages aren't loaded, reopen the chat at the newest message instead of adding it out of order.
+            if message_contents.has_newer_messages is True:
+                query_manager.query(
+                    "data/chat.sqlite", "add_message", parent.chat, message,
+                    owner = self,
+                    on_result = lambda message_id: parent.parentWidget().open_chat(parent.chat),
+                    write = True
+                )
+                
+                return # Return early.
             
-            main_layout.addWidget(message_widget)
+            # Show the message straight away, it's given its ID once it's been added to the database.
+            message_widget = message_contents.add_message_widget(message)
+            message_contents.pending_widgets.append(message_widget)
+            
+            query_manager.query(
+                "data/chat.sqlite", "add_message", parent.chat, message,
+                owner = self,
+                on_result = lambda message_id: self._on_message_added(message_id, message_widget),
+                write = True # The message is still sent if the chat is closed first.
+            )
             
             # Push scroll area to bottom.
             QTimer.singleShot(10, message_contents.update_size)
             QTimer.singleShot(10, parent.scroll_to_bottom)
+        
+        def _on_message_added(self, message_id: int, message_widget: QWidget):
+            """A function called once a sent message has been added to the database.
             
-            # Add the message to the database.
-            database : DatabaseManager = QApplication.instance().property("DatabaseManager")("data/chat.sqlite")
-            database.add_message(parent.chat, message)
+            Args:
+                message_id (int): ID given to the message.
+                message_widget (QWidget): Widget displaying the message.
+            """
+            message_contents = self.parentWidget().message_contents
             
-            # Clear text_edit.
-            self.text_edit.clear()
+            message_contents.message_widgets[message_id] = message_widget
+            message_contents.pending_widgets.remove(message_widget)
+            
+            # Messages sent quickly after each other can be added out of order.
+            if message_contents.newest_message_id is None or message_id > message_contents.newest_message_id:
+                message_contents.newest_message_id = message_id
 
 class CreateChat(QWidget):
     def __init__(self, parent: QWidget):
@@ -582,11 +998,11 @@ class CreateChat(QWidget):
             # So a user has been found, it's not themselves - great, continue!
             chat_database : DatabaseManager = QApplication.instance().property("DatabaseManager")("data/chat.sqlite")
                         
-            # Check if the user already has a chat with the other person.
-            personal_chat = chat_database.get_personal_chat(logged_member, adding_member)
+            # Create the chat, unless the user already has one with the other person.
+            personal_chat, created = chat_database.get_or_create_personal_chat(logged_member, adding_member)
             
             # They already have a chat!
-            if personal_chat is not None:
+            if created is False:
                 error_label.setText("ALREADY CHATTING")
                 error_label.show()
                 
@@ -597,9 +1013,6 @@ class CreateChat(QWidget):
             else:
                 error_label.hide()
             
-            # Create the chat.
-            chat_database.create_chat(logged_member, adding_member)
-            
             # Refresh chats sidebar.
             window.refresh_chats()
     
@@ -627,4 +1040,160 @@ class CreateChat(QWidget):
             """A function to update the size of the error label, usually triggered when the text is updated."""
             self.setFixedSize(self.sizeHint())
             
-            self.move(self.parentWidget().email_input.width() - self.width(), 0) # Right top of email input.
\ No newline at end of file
+            self.move(self.parentWidget().email_input.width() - self.width(), 0) # Right top of email input.
+
+class SearchChat(QWidget):
+    def __init__(self, parent: QWidget):
+        """A subclass of QWidget, used to search the messages of every chat the user is a part of.
+        
+        Args:
+            parent (QWidget): Parent object of the search chat, typically the Chat window.
+        """
+        super().__init__(parent)
+        self._set_design()
+        self._set_widgets()
+        self._set_layout()
+        
+        # Show the window.
+        self.show()
+    
+    def _set_design(self):
+        """A function to set the design of the search chat widget."""
+        parent = self.parentWidget()
+        self.setFixedSize(parent.width() - parent.chats.width(), parent.height() - parent.top_bar.height())
+        
+        self.move(parent.chats.width(), parent.top_bar.height())
+    
+    def _set_widgets(self):
+        """A function to set relevant widgets to the search chat widget."""
+        self.search_input = self.SearchInput(self)
+        
+        # Search once the user stops typing, rather than on every key press.
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        
+        self.search_job : QueryJob = None # Search still running, cancelled by a newer one.
+        
+        self.results_widget = QWidget(self)
+        self.results_widget.setFixedWidth(self.width())
+        self.results_widget.setStyleSheet("background-color: transparent; border: none;")
+        self.results_layout = QVBoxLayout(self.results_widget)
+        self.results_layout.setContentsMargins(0, 0, 0, 0)
+        self.results_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+    
+    def _set_layout(self):
+        """A function to set the layout of the search chat widget."""
+        self.main_layout = QVBoxLayout(self)
+        self.main_layout.setSpacing(0)
+        self.main_layout.setContentsMargins(0, 0, 0, 0)
+        
+        scroll_area = QScrollArea(self)
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(self.results_widget)
+        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        scroll_area.setStyleSheet("background-color: transparent; border: none;")
+        
+        self.main_layout.addWidget(self.search_input)
+        self.main_layout.addWidget(scroll_area)
+        
+        self.setLayout(self.main_layout)
+    
+    def search(self):
+        """A function to search the chats for the entered text off the GUI thread, replacing the shown results once found."""
+        logged_member : Member = QApplication.instance().property("LoggedMember")
+        query_manager : QueryManager = QApplication.instance().property("QueryManager")
+        
+        # Only the newest search is shown, an older one still running is dropped.
+        if self.search_job is not None:
+            self.search_job.cancel()
+        
+        self.search_job = query_manager.query(
+            "data/chat.sqlite", "search_messages", logged_member, self.search_input.text(),
+            owner = self,
+            on_result = self.show_results,
+            on_error = self._on_error
+        )
+    
+    def show_results(self, results: list[SearchResult]):
+        """A function to replace the shown results with the results of the newest search.
+        
+        Args:
+            results (list[SearchResult]): Matching messages, best match first.
+        """
+        self.search_job = None
+        
+        # Remove the old results.
+        while self.results_layout.count() > 0:
+            self.results_layout.takeAt(0).widget().deleteLater()
+        
+        for result in results:
+            self.results_layout.addWidget(self.ResultButton(self.results_widget, result))
+    
+    def _on_error(self, error: Exception):
+        """A function called if a search failed.
+        
+        Args:
+            error (Exception): Error raised by the query.
+        """
+        self.search_job = None
+        
+        print(f"Failed to search chats: {error}")
+    
+    class SearchInput(QLineEdit):
+        def __init__(self, parent: QWidget):
+            """A subclass of QLineEdit, used for the user to input the text they're searching for.
+            
+            Args:
+                parent (QWidget): Parent of the search input, typically a search chat widget.
+            """
+            super().__init__(parent)
+            self.colour_manager : ColourManager = QApplication.instance().property("ColourManager")
+            
+            self.setFixedSize(parent.width(), 50)
+            
+            self.setPlaceholderText("Search chats!")
+            
+            self.setStyleSheet(
+                f"background-color: {self.colour_manager.text};"
+                f"color: {self.colour_manager.header};"
+                "border: none;"
+            )
+    
+    class ResultButton(QPushButton):
+        def __init__(self, parent: QWidget, result: SearchResult):
+            """A subclass of QPushButton, used to display a search result and jump to it when clicked.
+            
+            Args:
+                parent (QWidget): Parent of the result button, typically the results widget.
+                result (SearchResult): Search result the button belongs to.
+            """
+            super().__init__(parent)
+            self.result = result
+            self.colour_manager : ColourManager = QApplication.instance().property("ColourManager")
+            self.font_manager : FontManager = QApplication.instance().property("FontManager")
+            
+            member = self.result.message.member
+            self.setText(f"{member.forename.capitalize()} {member.surname.capitalize()}: {self.result.snippet}")
+            self.setFont(self.font_manager.geist.regular)
+            self.setFixedHeight(40)
+            
+            self.setStyleSheet(
+                f"background-color: {self.colour_manager.header};"
+                f"color: {self.colour_manager.text};"
+                "text-align: left;"
+                "border: none;"
+            )
+            
+            self.clicked.connect(self._on_click)
+        
+        def _on_click(self):
+            """A function called when the result is clicked, opening its chat at the found message."""
+            window = self.parentWidget().parentWidget().parentWidget().parentWidget().parentWidget()
+            
+            database : DatabaseManager = QApplication.instance().property("DatabaseManager")("data/chat.sqlite")
+            chat = database.get_chat(self.result.chat_id)
+            
+            window.open_chat(chat, self.result.message.id)
\ No newline at end of file
@@ -219,38 +219,60 @@ class ClassWindow(QWidget):
                 buttons = self.parentWidget()
                 window = buttons.parentWidget()
                 available_class : AvailableClass = window.available_class
-                error_label : QLabel = window.error_label
                 logged_member : Member = get_property("LoggedMember")
-                database_manager : DatabaseManager = get_property("DatabaseManager")(path("/data/gym.sqlite"))
-                tutor_member : Member = database_manager.get_member(available_class.tutor_id)
+                query_manager : QueryManager = get_property("QueryManager")
                 
-                # Check if user is already in the class or not.
-                # Get updated class value.
-                applying_class = database_manager.get_class(available_class.id)
+                self.setEnabled(False) # Stop repeat clicks until the application is done.
                 
-                if logged_member.id in applying_class.applied_members:
+                # Apply off the GUI thread, the member is still applied if the window is closed first.
+                query_manager.run(
+                    self._apply, logged_member, available_class.id,
+                    owner = self,
+                    on_result = self._on_applied,
+                    write = True
+                )
+            
+            @staticmethod
+            def _apply(logged_member: Member, class_id: int) -> EnrollmentResult | None:
+                """A function to add a member to a class and message them from the tutor, run on a worker thread.
+                
+                Args:
+                    logged_member (Member): Member applying to the class.
+                    class_id (int): ID of the class being applied to.
+                
+                Returns:
+                    EnrollmentResult | None: Outcome of applying, None if the class no longer exists.
+                """
+                # Enroll, create the chat with the tutor and welcome the member in one transaction.
+                chat_database = DatabaseManager(path("/data/chat.sqlite"))
+                
+                return chat_database.apply_to_class(
+                    logged_member,
+                    class_id,
+                    "Hey, {forename}! You applied for {title}, please attend on: {start_date}",
+                    path("/data/gym.sqlite")
+                )
+            
+            def _on_applied(self, result: EnrollmentResult | None):
+                """A function called once the member has applied to the class.
+                
+                Args:
+                    result (EnrollmentResult | None): Outcome of applying, None if the class no longer exists.
+                """
+                self.setEnabled(True)
+                
+                if result is EnrollmentResult.ENROLLED:
+                    return # Return early, nothing to show.
+                
+                error_label : QLabel = self.parentWidget().parentWidget().error_label
+                
+                if result is EnrollmentResult.ALREADY_ENROLLED:
                     error_label.setText("YOU'RE ALREADY IN THE CLASS")
-                    error_label.show()
-
-                    return # Return early.
                 
-                # Add the member to the class.
-                database_manager.add_member_to_class(logged_member, available_class)
+                elif result is EnrollmentResult.FULL:
+                    error_label.setText("THE CLASS IS FULL")
                 
-                # Create a new chat with the tutor.
-                class_database : DatabaseManager = get_property("DatabaseManager")(path("/data/chat.sqlite"))
-                class_database.create_chat(logged_member, tutor_member)
+                else:
+                    error_label.setText("THE CLASS NO LONGER EXISTS")
                 
-                # Get the chat created.
-                new_chat = class_database.get_personal_chat(tutor_member, logged_member)
-                class_database.add_message(
-                    new_chat,
-                    Message(
-                        tutor_member,
-                        (
-                            f"Hey, {logged_member.forename.capitalize()}! "
-                            f"You applied for {applying_class.title}, "
-                            f"please attend on: {str(applying_class.start_date)}"
-                        )
-                    )
-                )
\ No newline at end of file
+                error_label.show()
\ No newline at end of file
@@ -44,6 +44,12 @@ class ClassesWindow(QWidget):
 class ClassesWidget(QWidget):
     def __init__(self, parent: QWidget):
         super().__init__(parent)
+        self.page_size = 20 # Classes loaded at a time.
+        self.loaded_classes = 0 # Amount of classes shown, the offset of the next page.
+        self.has_more_classes = True
+        self.loading_classes = False # If a page of classes is being loaded.
+        self.opened_at = datetime.now() # Classes starting from when the window was opened are shown.
+        
         self._set_design()
         self._set_layout()
         
@@ -69,24 +75,98 @@ class ClassesWidget(QWidget):
         self.content_layout.setContentsMargins(5, 10, 5, 0)
         self.content_layout.setSpacing(15)
         
-        scroll_area = QScrollArea(self)
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setWidget(self.content_widget)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll_area.setStyleSheet("background-color: transparent;")
+        self.scroll_area = QScrollArea(self)
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setWidget(self.content_widget)
+        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.scroll_area.setStyleSheet("background-color: transparent;")
+        
+        # Load the next page of classes once the user scrolls to the bottom.
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self._on_scroll)
         
-        self.main_layout.addWidget(scroll_area)
+        self.main_layout.addWidget(self.scroll_area)
             
         self.setLayout(self.main_layout)
     
     def add_available_classes(self):
-        database_manager : DatabaseManager = QApplication.instance().property("DatabaseManager")(path("/data/gym.sqlite"))
-
-        # For each available class in the database.
-        for available_class in database_manager.get_all_classes():
+        """A function to load the next page of upcoming classes, in the order they start."""
+        if self.has_more_classes is False or self.loading_classes is True:
+            return # Return early, every upcoming class is shown or the next page is on its way.
+        
+        query_manager : QueryManager = QApplication.instance().property("QueryManager")
+        
+        self.loading_classes = True
+        
+        # Load the page off the GUI thread, dropped if the window is closed first.
+        query_manager.run(
+            self._get_classes,
+            start_from = self.opened_at,
+            limit = self.page_size,
+            offset = self.loaded_classes,
+            owner = self,
+            on_result = self._on_classes_loaded,
+            on_error = self._on_error
+        )
+    
+    @staticmethod
+    def _get_classes(start_from: datetime, limit: int, offset: int) -> list[AvailableClass]:
+        """A function to get a page of upcoming classes with their tutors cached, run on a worker thread.
+        
+        Args:
+            start_from (datetime): Earliest start of the classes.
+            limit (int): Most classes returned.
+            offset (int): Amount of classes to skip.
+        
+        Returns:
+            list[AvailableClass]: Page of upcoming classes.
+        """
+        database_manager = DatabaseManager(path("/data/gym.sqlite"))
+        
+        available_classes = database_manager.get_classes(start_from = start_from, limit = limit, offset = offset)
+        
+        # Fetch every tutor of the page at once, so each card's tutor is already cached.
+        database_manager.get_members([available_class.tutor_id for available_class in available_classes])
+        
+        return available_classes
+    
+    def _on_classes_loaded(self, available_classes: list[AvailableClass]):
+        """A function called with a loaded page of upcoming classes, adding them to the bottom.
+        
+        Args:
+            available_classes (list[AvailableClass]): Page of upcoming classes.
+        """
+        self.loading_classes = False
+        
+        # A short page means there's no more upcoming classes.
+        if len(available_classes) < self.page_size:
+            self.has_more_classes = False
+        
+        # For each upcoming class in the page.
+        for available_class in available_classes:
             self.content_layout.addWidget(ClassWidget(self, available_class))
         
+        self.loaded_classes += len(available_classes)
+    
+    def _on_error(self, error: Exception):
+        """A function called if a page of classes failed to load.
+        
+        Args:
+            error (Exception): Error raised by the query.
+        """
+        self.loading_classes = False
+        
+        print(f"Failed to load classes: {error}")
+    
+    def _on_scroll(self, value: int):
+        """A function called when the classes are scrolled, adding the next page at the bottom.
+
+        Args:
+            value (int): New value of the scroll bar.
+        """
+        if value == self.scroll_area.verticalScrollBar().maximum():
+            self.add_available_classes()
+        
 class ClassWidget(QWidget):
     def __init__(self, parent: QWidget, available_class: AvailableClass) -> None:
         """A subclass of QWidget, used to display an available class in the content widget.
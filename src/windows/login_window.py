@@ -467,7 +467,7 @@ class LoginPanel(QWidget):
             def _on_click(self):
                 """A function called when the login button is clicked."""
                 
-                database : DatabaseManager = QApplication.instance().property("DatabaseManager")("data/gym.sqlite")
+                query_manager : QueryManager = QApplication.instance().property("QueryManager")
                 
                 login_panel = self.parentWidget().parentWidget()
                 
@@ -495,8 +495,31 @@ class LoginPanel(QWidget):
 
                     return # Exit early.
 
-                ## Check if the email and password is valid to the database.
-                member = database.get_member(email = email_line.text())
+                ## Check if the email and password is valid to the database, off the GUI thread.
+                self.setEnabled(False) # Stop repeat clicks until the lookup is done.
+                
+                query_manager.query(
+                    "data/gym.sqlite", "get_member",
+                    email = email_line.text(),
+                    owner = self,
+                    on_result = self._on_member_found,
+                    on_error = self._on_error
+                )
+            
+            def _on_member_found(self, member: Member | None):
+                """A function called with the member found by the login lookup.
+                
+                Args:
+                    member (Member | None): Member with the entered email, None if there isn't one.
+                """
+                self.setEnabled(True)
+                
+                login_panel = self.parentWidget().parentWidget()
+                
+                email_input : QWidget = login_panel.email_input
+                password_input : QWidget = login_panel.password_input
+                
+                password_line : QLineEdit = password_input.line_edit
                 
                 # If no member was found.
                 if member is None:
@@ -515,6 +538,16 @@ class LoginPanel(QWidget):
                     print("Successful login!")
                     
                     login_panel.parentWidget().parentWidget().login_member(member)
+            
+            def _on_error(self, error: Exception):
+                """A function called if the login lookup failed.
+                
+                Args:
+                    error (Exception): Error raised by the lookup.
+                """
+                self.setEnabled(True)
+                
+                print(f"Login failed: {error}")
         
         class Register(Button):
             def __init__(self, parent: QWidget):
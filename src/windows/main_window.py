@@ -24,6 +24,7 @@ class MainWindow(QWidget):
         
         self._set_design()
         self._set_widgets()
+        self._set_shortcuts()
     
     def _set_design(self):
         """A function to set the design of a QWidget."""
@@ -46,6 +47,20 @@ class MainWindow(QWidget):
         # Change the window title to reflect new window.
         self.setWindowTitle(f"{self.application_name} - Login")
     
+    def _set_shortcuts(self):
+        """A function to add the developer shortcuts to the main window."""
+        # Turn query instrumentation on or off.
+        self.toggle_queries_shortcut = QShortcut(QKeySequence("Ctrl+Shift+I"), self)
+        self.toggle_queries_shortcut.activated.connect(self.toggle_query_instrumentation)
+        
+        # Dump the queries recorded so far.
+        self.dump_queries_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        self.dump_queries_shortcut.activated.connect(query_profiler.dump)
+    
+    def toggle_query_instrumentation(self):
+        """A function to turn query instrumentation on or off."""
+        query_profiler.set_enabled(not query_profiler.enabled, QApplication.instance().property("ConnectionPool"))
+    
     def login_member(self, member: Member) -> None:
         """Function to log a user into the application.
 